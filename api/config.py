@@ -37,7 +37,10 @@ class RedisSettings(BaseSettings):
         default="redis://localhost:6379/0",
         description="Redis connection URL"
     )
-    redis_max_connections: int = Field(default=10, description="Max Redis connections (reduced)")
+    redis_max_connections: int = Field(
+        default=2,
+        description="Max Redis connections (one for commands, one for pub/sub)"
+    )
     redis_socket_timeout: int = Field(default=5, description="Redis socket timeout")
 
     class Config:
@@ -61,6 +64,26 @@ class VectorDBSettings(BaseSettings):
         default="./storage/chromadb",
         description="ChromaDB persistence directory"
     )
+    chromadb_batch_size: int = Field(
+        default=200,
+        description="Max records per ChromaDB add request"
+    )
+    chromadb_max_concurrent_batches: int = Field(
+        default=2,
+        description="Max ChromaDB add requests in flight per call"
+    )
+    chromadb_two_stage_search: bool = Field(
+        default=False,
+        description="Fetch candidates from a sign-binarized collection, then re-rank with full-precision vectors"
+    )
+    chromadb_rerank_candidates: int = Field(
+        default=4,
+        description="Candidates fetched per requested result in two-stage search"
+    )
+    chromadb_quantize_int8: bool = Field(
+        default=False,
+        description="Send embeddings as int8 levels for smaller add requests; storage stays float32 (requires a cosine-space collection)"
+    )
 
     # Weaviate settings (Production)
     weaviate_url: str = Field(
@@ -130,6 +153,7 @@ class SecuritySettings(BaseSettings):
         description="Refresh token expiration in days"
     )
     password_min_length: int = Field(default=8, description="Minimum password length")
+    bcrypt_rounds: int = Field(default=12, description="bcrypt cost factor for password hashing")
     max_login_attempts: int = Field(default=5, description="Max failed login attempts")
     lockout_duration_minutes: int = Field(
         default=15,
@@ -203,6 +227,14 @@ class EmbeddingSettings(BaseSettings):
         default=True,
         description="Normalize embeddings to unit vectors"
     )
+    dimensions: Optional[int] = Field(
+        default=None,
+        description="Truncate embeddings to this many dimensions (None keeps the model's full size)"
+    )
+    store_int8: bool = Field(
+        default=True,
+        description="Store chunk embeddings in PostgreSQL as int8 levels with a per-vector scale"
+    )
 
     class Config:
         extra = "ignore"
@@ -64,6 +64,21 @@ async def init_database():
             async_session_maker = None
 
 
+def _create_missing_indexes(connection):
+    """Create model indexes that do not exist yet on already-created tables."""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            # Savepoint per index so existing data violating a new unique
+            # index does not abort schema setup
+            savepoint = connection.begin_nested()
+            try:
+                index.create(connection, checkfirst=True)
+                savepoint.commit()
+            except Exception as e:
+                savepoint.rollback()
+                logger.warning(f"Could not create index {index.name}: {e}")
+
+
 async def create_tables():
     """
     Create database tables based on SQLAlchemy models.
@@ -90,8 +105,21 @@ async def create_tables():
         # 2. Create documents table with foreign key to users
         # 3. Create document_chunks table for vector storage
         # 4. Create processing_jobs table for monitoring
+        from sqlalchemy import text
+
+        # Trigram operator classes used by the document search indexes. Kept
+        # out of the schema transaction: roles that may not create extensions
+        # still get every table, just without the trigram indexes.
+        try:
+            async with engine.begin() as conn:
+                await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        except Exception as e:
+            logger.warning(f"pg_trgm unavailable, skipping trigram search indexes: {e}")
+
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+            # create_all skips existing tables, so add any indexes they lack
+            await conn.run_sync(_create_missing_indexes)
 
         logger.info("✅ Database tables created successfully")
 
@@ -20,6 +20,13 @@ except ImportError:
     SqlAlchemyIntegration = None
     SENTRY_AVAILABLE = False
 
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    uvloop = None
+    UVLOOP_AVAILABLE = False
+
 import structlog
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
@@ -33,9 +40,9 @@ from starlette.responses import Response
 from api.config import settings
 from api.database import create_tables, close_db_connections
 from api.routers import auth, documents, chat, health, admin, websocket
-from api.services.monitoring import setup_monitoring
+from api.services.monitoring import setup_monitoring, start_queue_logging, stop_queue_logging
 from api.services.cache import setup_redis
-from api.services.vector_db import setup_chromadb
+from api.services.vector_db import setup_chromadb, set_query_embedder
 from model.embeddings.service import EmbeddingService
 from model.llm.service import LLMService
 
@@ -177,6 +184,8 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan management."""
+    # Log writes happen on a listener thread, not on the event loop
+    start_queue_logging()
     logger.info("🚀 Starting ThinkDocs application", version=settings.app_version)
 
     try:
@@ -206,12 +215,13 @@ async def lifespan(app: FastAPI):
 
         # Initialize ChromaDB
         logger.info("🔧 Initializing ChromaDB...")
-        await setup_chromadb()
+        await setup_chromadb(use_async_client=True)
         logger.info("✅ ChromaDB initialization completed")
 
         # Initialize ML services
         logger.info("🔧 Initializing ML services...")
-        app.state.embedding_service = EmbeddingService()
+        app.state.embedding_service = EmbeddingService(dimensions=settings.embedding.dimensions)
+        set_query_embedder(app.state.embedding_service)
         app.state.llm_service = LLMService()
         logger.info("✅ ML services initialization completed")
 
@@ -234,6 +244,7 @@ async def lifespan(app: FastAPI):
         logger.info("🔄 Shutting down application...")
         await close_db_connections()
         logger.info("✅ Application shutdown completed")
+        stop_queue_logging()
 
 
 def create_application() -> FastAPI:
@@ -496,6 +507,10 @@ app = create_application()
 if __name__ == "__main__":
     import uvicorn
 
+    # libuv-based loop on Linux/macOS; default asyncio loop elsewhere
+    if UVLOOP_AVAILABLE:
+        uvloop.install()
+
     uvicorn.run(
         "api.main:app",
         host=settings.api.host,
@@ -504,4 +519,5 @@ if __name__ == "__main__":
         workers=settings.api.workers if not settings.api.reload else 1,
         log_level=settings.monitoring.log_level.lower(),
         access_log=True,
+        loop="uvloop" if UVLOOP_AVAILABLE else "asyncio",
     )
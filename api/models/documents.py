@@ -4,7 +4,7 @@ Document database models for production-ready persistence.
 
 from datetime import datetime
 from typing import List, Optional
-from sqlalchemy import Column, String, Integer, DateTime, Text, JSON, ForeignKey, Boolean
+from sqlalchemy import Column, String, Integer, DateTime, Text, JSON, ForeignKey, Boolean, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -12,10 +12,32 @@ import uuid
 from api.database import Base
 
 
+def _pg_trgm_installed(ddl, target, bind, **kw) -> bool:
+    """Create trigram indexes only where the pg_trgm extension is installed."""
+    if bind is None:
+        return True
+    result = bind.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'"))
+    return result.first() is not None
+
+
 class Document(Base):
     """Document model for storing uploaded documents and their metadata."""
 
     __tablename__ = "documents"
+    __table_args__ = (
+        # Trigram indexes serve the ILIKE '%q%' search on title and filename
+        Index(
+            "ix_documents_title_trgm", "title",
+            postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}
+        ).ddl_if(callable_=_pg_trgm_installed),
+        Index(
+            "ix_documents_filename_trgm", "filename",
+            postgresql_using="gin", postgresql_ops={"filename": "gin_trgm_ops"}
+        ).ddl_if(callable_=_pg_trgm_installed),
+        # Per-user library listing, newest first, optionally filtered by status
+        Index("ix_documents_user_upload", "user_id", text("upload_date DESC"), text("id DESC")),
+        Index("ix_documents_user_status", "user_id", "status"),
+    )
 
     # Primary key
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
@@ -78,6 +100,11 @@ class DocumentChunk(Base):
     """Document chunks for vector storage and retrieval."""
 
     __tablename__ = "document_chunks"
+    __table_args__ = (
+        # Ordered chunk reads and per-page filtering within a document
+        Index("ix_chunks_doc_idx", "document_id", "chunk_index"),
+        Index("ix_chunks_doc_page", "document_id", "page_number"),
+    )
 
     # Primary key
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
@@ -4,18 +4,29 @@ Production-grade User model with comprehensive security features.
 
 from datetime import datetime, timedelta
 from typing import Optional
-from sqlalchemy import Column, String, DateTime, Boolean, Text, JSON, Integer
+from sqlalchemy import Column, String, DateTime, Boolean, Text, JSON, Integer, Index, text
 from sqlalchemy.orm import relationship
+import hashlib
+import hmac
 import uuid
 import secrets
 
 from api.database import Base
 
 
+def hash_token(token: str) -> str:
+    """Return the SHA-256 hex digest stored in place of a plaintext token."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
 class User(Base):
     """Production-grade User model with security and compliance features."""
 
     __tablename__ = "users"
+    __table_args__ = (
+        # Case-insensitive email lookups and uniqueness
+        Index("ux_users_email_lower", text("lower(email)"), unique=True),
+    )
 
     # Primary key
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
@@ -34,11 +45,11 @@ class User(Base):
     is_premium = Column(Boolean, nullable=False, default=False)
 
     # Email verification
-    email_verification_token = Column(String(255), nullable=True)
+    email_verification_token = Column(String(255), nullable=True, unique=True, index=True)  # SHA-256 of the token
     email_verification_expires = Column(DateTime, nullable=True)
 
     # Password reset
-    password_reset_token = Column(String(255), nullable=True)
+    password_reset_token = Column(String(255), nullable=True, unique=True, index=True)  # SHA-256 of the token
     password_reset_expires = Column(DateTime, nullable=True)
 
     # Security features
@@ -69,21 +80,24 @@ class User(Base):
     documents = relationship("Document", back_populates="user", cascade="all, delete-orphan")
 
     def generate_email_verification_token(self) -> str:
-        """Generate a secure email verification token."""
-        self.email_verification_token = secrets.token_urlsafe(32)
+        """Generate a secure email verification token; only its hash is stored."""
+        token = secrets.token_urlsafe(32)
+        self.email_verification_token = hash_token(token)
         self.email_verification_expires = datetime.utcnow() + timedelta(hours=24)
-        return self.email_verification_token
+        return token
 
     def generate_password_reset_token(self) -> str:
-        """Generate a secure password reset token."""
-        self.password_reset_token = secrets.token_urlsafe(32)
+        """Generate a secure password reset token; only its hash is stored."""
+        token = secrets.token_urlsafe(32)
+        self.password_reset_token = hash_token(token)
         self.password_reset_expires = datetime.utcnow() + timedelta(hours=2)
-        return self.password_reset_token
+        return token
 
     def is_email_verification_valid(self, token: str) -> bool:
         """Check if email verification token is valid."""
         return (
-            self.email_verification_token == token and
+            self.email_verification_token is not None and
+            hmac.compare_digest(self.email_verification_token, hash_token(token)) and
             self.email_verification_expires and
             datetime.utcnow() < self.email_verification_expires
         )
@@ -91,7 +105,8 @@ class User(Base):
     def is_password_reset_valid(self, token: str) -> bool:
         """Check if password reset token is valid."""
         return (
-            self.password_reset_token == token and
+            self.password_reset_token is not None and
+            hmac.compare_digest(self.password_reset_token, hash_token(token)) and
             self.password_reset_expires and
             datetime.utcnow() < self.password_reset_expires
         )
@@ -269,6 +269,7 @@ async def register(
 
                 # TODO: Send verification email in background
                 # background_tasks.add_task(send_verification_email, user.email, user.email_verification_token)
+                # Note: the column stores a SHA-256 hash; mail the token returned by generate_email_verification_token()
 
                 return TokenResponse(
                     access_token=access_token,
@@ -210,6 +210,7 @@ async def register(
 
     # TODO: Send verification email in background
     # background_tasks.add_task(send_verification_email, user.email, user.email_verification_token)
+    # Note: the column stores a SHA-256 hash; mail the token returned by generate_email_verification_token()
 
     logger.info(f"User registered successfully: {user.email}")
 
@@ -63,6 +63,7 @@ class DocumentsListResponse(BaseModel):
     total: int = Field(..., description="Total number of documents", example=150)
     page: int = Field(default=1, description="Current page number", example=1)
     limit: int = Field(default=50, description="Items per page", example=50)
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page (keyset pagination)")
 
     class Config:
         json_schema_extra = {
@@ -89,6 +90,23 @@ class DocumentsListResponse(BaseModel):
             }
         }
 
+def _encode_cursor(cursor) -> Optional[str]:
+    """Serialize an (upload_date, id) keyset cursor for the API."""
+    if cursor is None:
+        return None
+    upload_date, document_id = cursor
+    return f"{upload_date.isoformat()},{document_id}"
+
+def _decode_cursor(cursor: Optional[str]):
+    """Parse an API cursor back into (upload_date, id)."""
+    if not cursor:
+        return None
+    try:
+        upload_date, document_id = cursor.split(",", 1)
+        return datetime.fromisoformat(upload_date), document_id
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
 # Mock documents database (in a real app, this would be a proper database)
 MOCK_DOCUMENTS = [
     {
@@ -140,6 +158,7 @@ async def get_documents(
     page: int = 1,
     limit: int = 50,
     status: Optional[str] = None,
+    cursor: Optional[str] = None,
     current_user: UserResponse = Depends(get_current_user_from_token),
     db: AsyncSession = Depends(get_db)
 ):
@@ -158,6 +177,7 @@ async def get_documents(
     - `page`: Page number (default: 1)
     - `limit`: Items per page (default: 50, max: 100)
     - `status`: Filter by processing status (optional)
+    - `cursor`: `next_cursor` from the previous page; takes precedence over `page`
 
     **Returns:**
     - List of documents with metadata
@@ -165,24 +185,29 @@ async def get_documents(
     - Current page and limit info
     """
 
+    keyset_cursor = _decode_cursor(cursor)
+
     # Try database first
     try:
         if db is not None:
             document_service = DocumentService(db)
-            documents, total = await document_service.get_documents(
+            documents, total, next_cursor = await document_service.get_documents(
                 user_id=current_user.id,
                 status=status,
                 page=page,
-                limit=limit
+                limit=limit,
+                cursor=keyset_cursor
             )
 
-            # If database has documents, use them
-            if documents:
+            # If database has documents, use them; a keyset page always comes
+            # from the database, even when it is empty
+            if documents or keyset_cursor is not None:
                 return DocumentsListResponse(
                     documents=[DocumentResponse(**doc.to_dict()) for doc in documents],
                     total=total,
                     page=page,
-                    limit=limit
+                    limit=limit,
+                    next_cursor=_encode_cursor(next_cursor)
                 )
 
     except Exception as e:
@@ -3,15 +3,18 @@ Socket.IO router for real-time communication.
 Handles chat messages, document processing updates, and system notifications.
 """
 
+import asyncio
 import logging
+from dataclasses import dataclass, fields
 from datetime import datetime
-from typing import Dict, Set
+from typing import Dict, Optional, Set, Tuple
 
 import socketio
 from fastapi import APIRouter, HTTPException
 import jwt
 
 from api.config import settings
+from api.services.auth import decode_hs256_token
 
 logger = logging.getLogger(__name__)
 
@@ -19,12 +22,46 @@ logger = logging.getLogger(__name__)
 sio = socketio.AsyncServer(
     cors_allowed_origins="*",
     logger=True,
-    engineio_logger=True
+    engineio_logger=True,
+    # Notifications are small JSON payloads; only compress large ones
+    compression_threshold=8192
 )
 
 # Create FastAPI router
 router = APIRouter()
 
+
+# Typed client event payloads, parsed once per event
+@dataclass(slots=True)
+class _EventPayload:
+    @classmethod
+    def from_dict(cls, data: Optional[dict]):
+        """Build the payload, ignoring keys the event does not define."""
+        if not data:
+            return cls()
+        try:
+            return cls(**data)
+        except TypeError:
+            return cls(**{f.name: data[f.name] for f in fields(cls) if f.name in data})
+
+
+@dataclass(slots=True)
+class SessionPayload(_EventPayload):
+    session_id: Optional[str] = None
+
+
+@dataclass(slots=True)
+class SendMessagePayload(_EventPayload):
+    session_id: Optional[str] = None
+    message: Optional[str] = None
+    timestamp: Optional[str] = None
+
+
+@dataclass(slots=True)
+class DocumentPayload(_EventPayload):
+    document_id: Optional[str] = None
+
+
 # Connection manager for Socket.IO connections
 class ConnectionManager:
     def __init__(self):
@@ -41,7 +78,8 @@ class ConnectionManager:
             self.active_connections[user_id] = set()
 
         self.active_connections[user_id].add(sid)
-        logger.info(f"User {user_id} connected via Socket.IO (sid: {sid})")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("User %s connected via Socket.IO (sid: %s)", user_id, sid)
 
     async def disconnect(self, sid: str, user_id: str):
         """Remove a Socket.IO connection."""
@@ -57,7 +95,8 @@ class ConnectionManager:
         for doc_connections in self.document_processing.values():
             doc_connections.discard(sid)
 
-        logger.info(f"User {user_id} disconnected from Socket.IO (sid: {sid})")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("User %s disconnected from Socket.IO (sid: %s)", user_id, sid)
 
     async def send_personal_message(self, message: dict, user_id: str):
         """Send a message to a specific user."""
@@ -66,7 +105,7 @@ class ConnectionManager:
                 try:
                     await sio.emit('personal_message', message, room=sid)
                 except Exception as e:
-                    logger.error(f"Failed to send message to {sid}: {e}")
+                    logger.error("Failed to send message to %s: %s", sid, e)
                     self.active_connections[user_id].discard(sid)
 
     async def broadcast_to_session(self, message: dict, session_id: str):
@@ -76,7 +115,7 @@ class ConnectionManager:
                 try:
                     await sio.emit('message_received', message, room=sid)
                 except Exception as e:
-                    logger.error(f"Failed to broadcast to session {session_id}: {e}")
+                    logger.error("Failed to broadcast to session %s: %s", session_id, e)
                     self.chat_sessions[session_id].discard(sid)
 
     async def broadcast_document_update(self, message: dict, document_id: str):
@@ -86,7 +125,7 @@ class ConnectionManager:
                 try:
                     await sio.emit('document_update', message, room=sid)
                 except Exception as e:
-                    logger.error(f"Failed to broadcast document update: {e}")
+                    logger.error("Failed to broadcast document update: %s", e)
                     self.document_processing[document_id].discard(sid)
 
     def join_chat_session(self, sid: str, session_id: str):
@@ -114,6 +153,38 @@ class ConnectionManager:
 # Global connection manager instance
 manager = ConnectionManager()
 
+# Progress updates are coalesced per (user_id, document_id) and flushed on a
+# fixed window so clients receive at most one update per window per document.
+PROGRESS_FLUSH_INTERVAL = 0.05
+_pending_progress: Dict[Tuple[str, str], dict] = {}
+_progress_flusher_task: Optional[asyncio.Task] = None
+
+async def _progress_flusher():
+    """
+    Periodically drain pending progress updates and emit the latest ones.
+
+    Exits once a window passes with nothing pending; _queue_progress starts
+    it again on the next update.
+    """
+    global _pending_progress
+    while True:
+        await asyncio.sleep(PROGRESS_FLUSH_INTERVAL)
+        if not _pending_progress:
+            return
+
+        pending, _pending_progress = _pending_progress, {}
+        for (user_id, _), message in pending.items():
+            try:
+                await manager.send_personal_message(message, user_id)
+            except Exception as e:
+                logger.error("Failed to flush progress update for %s: %s", user_id, e)
+
+def _ensure_progress_flusher():
+    """Start the progress flusher task on the running loop if needed."""
+    global _progress_flusher_task
+    if _progress_flusher_task is None or _progress_flusher_task.done():
+        _progress_flusher_task = asyncio.create_task(_progress_flusher())
+
 async def authenticate_socket(sid: str, auth_data: dict) -> str:
     """Authenticate Socket.IO connection using token."""
     token = auth_data.get("token")
@@ -125,7 +196,7 @@ async def authenticate_socket(sid: str, auth_data: dict) -> str:
 
     try:
         # Verify JWT token
-        payload = jwt.decode(token, settings.security.secret_key, algorithms=["HS256"])
+        payload = decode_hs256_token(token, settings.security.secret_key)
         user_id = payload.get("sub")
         if not user_id:
             logger.warning(f"Invalid token for connection {sid}")
@@ -158,7 +229,8 @@ async def connect(sid, environ, auth):
             "user_id": user_id
         }, room=sid)
 
-        logger.info(f"User {user_id} connected successfully (sid: {sid})")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("User %s connected successfully (sid: %s)", user_id, sid)
 
     except Exception as e:
         logger.error(f"Connection failed for {sid}: {e}")
@@ -177,12 +249,13 @@ async def disconnect(sid):
     if user_id:
         await manager.disconnect(sid, user_id)
 
-    logger.info(f"Connection {sid} disconnected")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Connection %s disconnected", sid)
 
 @sio.event
 async def join_chat_session(sid, data):
     """Join a chat session."""
-    session_id = data.get("session_id")
+    session_id = SessionPayload.from_dict(data).session_id
     if session_id:
         manager.join_chat_session(sid, session_id)
         await sio.emit('joined_session', {
@@ -193,7 +266,7 @@ async def join_chat_session(sid, data):
 @sio.event
 async def leave_chat_session(sid, data):
     """Leave a chat session."""
-    session_id = data.get("session_id")
+    session_id = SessionPayload.from_dict(data).session_id
     if session_id:
         manager.leave_chat_session(sid, session_id)
         await sio.emit('left_session', {
@@ -204,23 +277,21 @@ async def leave_chat_session(sid, data):
 @sio.event
 async def send_message(sid, data):
     """Send a message to a chat session."""
-    session_id = data.get("session_id")
-    message = data.get("message")
-    timestamp = data.get("timestamp", datetime.utcnow().isoformat())
+    payload = SendMessagePayload.from_dict(data)
 
-    if session_id and message:
+    if payload.session_id and payload.message:
         message_data = {
-            "session_id": session_id,
-            "message": message,
-            "timestamp": timestamp,
+            "session_id": payload.session_id,
+            "message": payload.message,
+            "timestamp": payload.timestamp or datetime.utcnow().isoformat(),
             "sid": sid
         }
-        await manager.broadcast_to_session(message_data, session_id)
+        await manager.broadcast_to_session(message_data, payload.session_id)
 
 @sio.event
 async def subscribe_document_processing(sid, data):
     """Subscribe to document processing updates."""
-    document_id = data.get("document_id")
+    document_id = DocumentPayload.from_dict(data).document_id
     if document_id:
         manager.subscribe_document_processing(sid, document_id)
         await sio.emit('subscribed_document', {
@@ -231,7 +302,7 @@ async def subscribe_document_processing(sid, data):
 @sio.event
 async def unsubscribe_document_processing(sid, data):
     """Unsubscribe from document processing updates."""
-    document_id = data.get("document_id")
+    document_id = DocumentPayload.from_dict(data).document_id
     if document_id:
         manager.unsubscribe_document_processing(sid, document_id)
         await sio.emit('unsubscribed_document', {
@@ -258,18 +329,38 @@ async def notify_document_processing_started(document_id: str, filename: str, us
         "timestamp": datetime.utcnow().isoformat()
     }, user_id)
 
-async def notify_document_processing_progress(document_id: str, progress: int, stage: str, user_id: str):
-    """Notify user of document processing progress."""
-    await manager.send_personal_message({
+def _queue_progress(document_id: str, progress: int, stage: str, user_id: str):
+    """Store a progress update for the next flush; must run on the event loop."""
+    key = (user_id, document_id)
+    previous = _pending_progress.get(key)
+    if previous is not None and previous["progress"] > progress:
+        return
+
+    _pending_progress[key] = {
         "type": "document_processing_progress",
         "document_id": document_id,
         "progress": progress,
         "stage": stage,
         "timestamp": datetime.utcnow().isoformat()
-    }, user_id)
+    }
+    _ensure_progress_flusher()
+
+async def notify_document_processing_progress(document_id: str, progress: int, stage: str, user_id: str):
+    """
+    Notify user of document processing progress.
+
+    Updates are buffered and sent by the progress flusher; only the most
+    advanced progress value per document is kept within a flush window.
+    """
+    _queue_progress(document_id, progress, stage, user_id)
+
+def _drop_pending_progress(document_id: str, user_id: str):
+    """Discard a buffered progress update so it cannot arrive after a final status."""
+    _pending_progress.pop((user_id, document_id), None)
 
 async def notify_document_processing_completed(document_id: str, filename: str, user_id: str):
     """Notify user that document processing is complete."""
+    _drop_pending_progress(document_id, user_id)
     await manager.send_personal_message({
         "type": "document_processing_completed",
         "document_id": document_id,
@@ -279,6 +370,7 @@ async def notify_document_processing_completed(document_id: str, filename: str,
 
 async def notify_document_processing_failed(document_id: str, filename: str, error: str, user_id: str):
     """Notify user that document processing failed."""
+    _drop_pending_progress(document_id, user_id)
     await manager.send_personal_message({
         "type": "document_processing_failed",
         "document_id": document_id,
@@ -2,15 +2,95 @@
 Authentication service for user management and token validation.
 """
 
+import base64
+import hashlib
+import hmac
+import json
 import logging
-from typing import Optional, Dict, Any
+import time
+from functools import lru_cache
+from typing import Optional, Dict, Any, Union
 import jwt
-from datetime import datetime
 
 from api.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Signing key bytes, encoded once instead of on every encode/decode
+_SECRET_KEY_BYTES = settings.security.secret_key.encode("utf-8")
+
+
+def _b64url_decode(segment: str) -> bytes:
+    """Decode a base64url segment, restoring stripped padding."""
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+@lru_cache(maxsize=8)
+def _hmac_template(key: bytes) -> "hmac.HMAC":
+    """Return a keyed HMAC-SHA256 object to copy for each verification."""
+    return hmac.new(key, None, hashlib.sha256)
+
+
+def hs256_verify(token: str, key: bytes) -> Optional[Dict[str, Any]]:
+    """
+    Verify an HS256 JWT using hashlib-backed HMAC.
+
+    This is a fast path for the tokens issued by this service. It returns
+    None for anything it does not handle (other algorithms, bad signatures,
+    expired or not-yet-valid tokens, audience claims) so callers can fall
+    back to jwt.decode for the full validation and error reporting.
+
+    Args:
+        token: JWT token string
+        key: HMAC secret key
+
+    Returns:
+        Decoded payload dict or None if the fast path cannot accept the token
+    """
+    try:
+        header_b64, payload_b64, signature_b64 = token.split(".")
+        header = json.loads(_b64url_decode(header_b64))
+        if not isinstance(header, dict) or header.get("alg") != "HS256":
+            return None
+
+        signing_input = f"{header_b64}.{payload_b64}".encode("ascii")
+        mac = _hmac_template(key).copy()
+        mac.update(signing_input)
+        expected = mac.digest()
+        if not hmac.compare_digest(expected, _b64url_decode(signature_b64)):
+            return None
+
+        payload = json.loads(_b64url_decode(payload_b64))
+        # jwt.decode rejects an aud claim when no audience is configured
+        if not isinstance(payload, dict) or "aud" in payload:
+            return None
+
+        now = time.time()
+        exp = payload.get("exp")
+        if exp is not None and (not isinstance(exp, (int, float)) or now >= exp):
+            return None
+        nbf = payload.get("nbf")
+        if nbf is not None and (not isinstance(nbf, (int, float)) or now < nbf):
+            return None
+
+        return payload
+    except (ValueError, UnicodeError):
+        return None
+
+
+def decode_hs256_token(token: str, secret_key: Union[str, bytes]) -> Dict[str, Any]:
+    """
+    Decode a JWT, trying the HS256 fast path before jwt.decode.
+
+    Raises the usual jwt exceptions when the token is rejected.
+    """
+    if isinstance(secret_key, str):
+        secret_key = secret_key.encode("utf-8")
+    payload = hs256_verify(token, secret_key)
+    if payload is not None:
+        return payload
+    return jwt.decode(token, secret_key, algorithms=["HS256"])
+
 
 async def get_current_user_from_token(token: str) -> Optional[Dict[str, Any]]:
     """
@@ -24,11 +104,7 @@ async def get_current_user_from_token(token: str) -> Optional[Dict[str, Any]]:
     """
     try:
         # Decode JWT token
-        payload = jwt.decode(
-            token,
-            settings.secret_key,
-            algorithms=["HS256"]
-        )
+        payload = decode_hs256_token(token, _SECRET_KEY_BYTES)
 
         # Extract user information
         user_id = payload.get("sub")
@@ -37,7 +113,7 @@ async def get_current_user_from_token(token: str) -> Optional[Dict[str, Any]]:
         exp = payload.get("exp")
 
         # Check if token is expired
-        if exp and datetime.utcnow().timestamp() > exp:
+        if exp and time.time() > exp:
             logger.warning("Token expired")
             return None
 
@@ -76,11 +152,9 @@ def create_access_token(user_data: Dict[str, Any], expires_delta: Optional[int]
         JWT token string
     """
     try:
-        # Set expiration time
-        if expires_delta:
-            expire = datetime.utcnow().timestamp() + expires_delta
-        else:
-            expire = datetime.utcnow().timestamp() + 3600  # 1 hour default
+        # Set expiration time (1 hour default)
+        now = time.time()
+        expire = now + (expires_delta or 3600)
 
         # Create payload
         payload = {
@@ -88,11 +162,11 @@ def create_access_token(user_data: Dict[str, Any], expires_delta: Optional[int]
             "username": user_data.get("username"),
             "email": user_data.get("email"),
             "exp": expire,
-            "iat": datetime.utcnow().timestamp()
+            "iat": now
         }
 
         # Encode token
-        token = jwt.encode(payload, settings.secret_key, algorithm="HS256")
+        token = jwt.encode(payload, _SECRET_KEY_BYTES, algorithm="HS256")
         return token
 
     except Exception as e:
@@ -3,6 +3,7 @@ Redis cache service for ThinkDocs.
 Handles caching, session storage, and pub/sub messaging.
 """
 
+import asyncio
 import json
 import logging
 from typing import Any, Optional, Dict, List
@@ -20,20 +21,29 @@ _redis_pool: Optional[Redis] = None
 
 
 async def setup_redis() -> Redis:
-    """Initialize Redis connection pool."""
+    """
+    Initialize Redis connection pool.
+
+    The pool is deliberately small (one command connection plus one for
+    pub/sub by default): throughput comes from pipelining on a connection,
+    not from connection count. A blocking pool makes callers wait for a free
+    connection instead of failing when the limit is reached.
+    """
     global _redis_pool
 
     if _redis_pool is None:
         try:
-            _redis_pool = redis.from_url(
+            pool = redis.BlockingConnectionPool.from_url(
                 settings.redis.redis_url,
                 encoding="utf-8",
                 decode_responses=True,
-                max_connections=20,
+                max_connections=settings.redis.redis_max_connections,
+                timeout=settings.redis.redis_socket_timeout,
                 retry_on_timeout=True,
                 socket_connect_timeout=5,
                 socket_timeout=5
             )
+            _redis_pool = Redis(connection_pool=pool)
 
             # Test connection
             await _redis_pool.ping()
@@ -53,11 +63,18 @@ async def get_redis() -> Redis:
     return _redis_pool
 
 
+async def get_pubsub():
+    """Get a dedicated pub/sub handle on the shared Redis pool."""
+    redis_client = await get_redis()
+    return redis_client.pubsub()
+
+
 async def close_redis():
     """Close Redis connection."""
     global _redis_pool
     if _redis_pool:
         await _redis_pool.close()
+        await _redis_pool.connection_pool.disconnect()
         _redis_pool = None
         logger.info("Redis connection closed")
 
@@ -67,6 +84,9 @@ class CacheService:
 
     def __init__(self):
         self.redis: Optional[Redis] = None
+        self._pending_gets: Dict[str, List[asyncio.Future]] = {}
+        self._flush_handle: Optional[asyncio.Handle] = None
+        self._flush_task: Optional[asyncio.Task] = None
 
     async def _get_redis(self) -> Redis:
         """Get Redis connection."""
@@ -75,14 +95,49 @@ class CacheService:
         return self.redis
 
     async def get(self, key: str) -> Optional[str]:
-        """Get value from cache."""
+        """
+        Get value from cache.
+
+        Concurrent gets are coalesced: requests made before the event loop's
+        next iteration are answered by one MGET round trip, so a lone get
+        waits for no timer.
+        """
         try:
-            redis_client = await self._get_redis()
-            return await redis_client.get(key)
+            await self._get_redis()
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending_gets.setdefault(key, []).append(future)
+            if self._flush_handle is None:
+                self._flush_handle = loop.call_soon(self._schedule_flush)
+            return await future
         except Exception as e:
             logger.error(f"Cache get error for key {key}: {e}")
             return None
 
+    def _schedule_flush(self):
+        """Start flushing the pending gets collected in this loop iteration."""
+        self._flush_handle = None
+        pending, self._pending_gets = self._pending_gets, {}
+        self._flush_task = asyncio.ensure_future(self._flush_gets(pending))
+
+    async def _flush_gets(self, pending: Dict[str, List[asyncio.Future]]):
+        """Resolve pending gets with a single MGET."""
+        keys = list(pending)
+        try:
+            redis_client = await self._get_redis()
+            values = await redis_client.mget(keys)
+        except Exception as e:
+            for futures in pending.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        for key, value in zip(keys, values):
+            for future in pending[key]:
+                if not future.done():
+                    future.set_result(value)
+
     async def set(
         self,
         key: str,
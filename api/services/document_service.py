@@ -3,10 +3,12 @@ Production-ready document service using database persistence.
 Replaces mock MOCK_DOCUMENTS with proper database operations.
 """
 
+from dataclasses import dataclass, asdict
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete
+from sqlalchemy import select, update, delete, func, tuple_, cast, case, literal, and_, JSON
+from sqlalchemy.dialects.postgresql import JSONB, aggregate_order_by
 from sqlalchemy.orm import selectinload
 
 from api.models.documents import Document, DocumentChunk, ProcessingJob
@@ -15,6 +17,61 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Columns needed to render a document in the library listing (Document.to_dict)
+_LIST_COLUMNS = (
+    Document.id, Document.filename, Document.title, Document.size,
+    Document.content_type, Document.status, Document.tags, Document.upload_date,
+    Document.processed_at, Document.user_id, Document.page_count, Document.word_count,
+)
+
+
+
+@dataclass(slots=True)
+class DocumentListItem:
+    """Lightweight row for the document library listing (no ORM state)."""
+    id: str
+    filename: str
+    title: str
+    size: int
+    content_type: str
+    status: str
+    tags: Optional[List[str]]
+    upload_date: Optional[datetime]
+    processed_at: Optional[datetime]
+    user_id: str
+    page_count: Optional[int]
+    word_count: Optional[int]
+
+    def to_dict(self) -> dict:
+        """Convert to the same API shape as Document.to_dict()."""
+        data = asdict(self)
+        data["tags"] = self.tags or []
+        data["upload_date"] = self.upload_date.isoformat() + "Z" if self.upload_date else None
+        data["processed_at"] = self.processed_at.isoformat() + "Z" if self.processed_at else None
+        return data
+
+
+# Tag added to documents once processing completes
+PROCESSED_TAG = "processed"
+
+
+def _tags_jsonb():
+    """Document.tags as JSONB, with NULL treated as an empty list."""
+    return func.coalesce(cast(Document.tags, JSONB), func.jsonb_build_array())
+
+
+def _tags_appended(tag: str):
+    """SQL expression for Document.tags with tag appended."""
+    return cast(_tags_jsonb().op("||")(func.jsonb_build_array(tag)), JSON)
+
+
+def _tags_including(tag: str):
+    """SQL expression for Document.tags with tag appended unless present."""
+    return case(
+        (_tags_jsonb().has_key(tag), Document.tags),
+        else_=_tags_appended(tag)
+    )
+
 
 class DocumentService:
     """Production document service with database persistence."""
@@ -62,28 +119,52 @@ class DocumentService:
         user_id: str,
         status: Optional[str] = None,
         page: int = 1,
-        limit: int = 50
-    ) -> tuple[List[Document], int]:
-        """Get user's documents with pagination."""
-        query = select(Document).where(Document.user_id == user_id)
-
+        limit: int = 50,
+        cursor: Optional[Tuple[datetime, str]] = None
+    ) -> tuple[List[DocumentListItem], int, Optional[Tuple[datetime, str]]]:
+        """
+        Get user's documents with pagination.
+
+        Only the listing columns are selected and rows are returned as
+        DocumentListItem objects rather than full Document entities.
+
+        When a cursor (upload_date, id) of the last document seen is given,
+        the page is fetched by keyset instead of OFFSET, so deep pages cost
+        the same as the first one. The returned next cursor is None on the
+        last page; one extra row is fetched to tell.
+        """
+        base_where = [Document.user_id == user_id]
         if status:
-            query = query.where(Document.status == status)
+            base_where.append(Document.status == status)
 
-        # Count total
+        # Count total (same filters as the page query)
         count_result = await self.db.execute(
-            select(Document.id).where(Document.user_id == user_id)
+            select(func.count()).select_from(Document).where(*base_where)
         )
-        total = len(count_result.fetchall())
+        total = count_result.scalar_one()
 
         # Paginate
-        offset = (page - 1) * limit
-        query = query.offset(offset).limit(limit).order_by(Document.upload_date.desc())
+        query = (
+            select(*_LIST_COLUMNS)
+            .where(*base_where)
+            .order_by(Document.upload_date.desc(), Document.id.desc())
+            .limit(limit + 1)
+        )
+        if cursor is not None:
+            query = query.where(tuple_(Document.upload_date, Document.id) < tuple_(*cursor))
+        else:
+            query = query.offset((page - 1) * limit)
 
         result = await self.db.execute(query)
-        documents = result.scalars().all()
+        documents = [DocumentListItem(**row) for row in result.mappings()]
 
-        return list(documents), total
+        # The extra row only signals that another page exists
+        next_cursor = None
+        if len(documents) > limit:
+            documents = documents[:limit]
+            next_cursor = (documents[-1].upload_date, documents[-1].id)
+
+        return documents, total, next_cursor
 
     async def update_document_status(
         self,
@@ -116,21 +197,22 @@ class DocumentService:
             if summary:
                 update_data["summary"] = summary
 
+            # Add processing tags in the same statement
+            if status == "completed" and stats:
+                update_data["tags"] = _tags_including(PROCESSED_TAG)
+
             # Update document
             result = await self.db.execute(
                 update(Document)
                 .where(Document.id == document_id)
                 .values(**update_data)
+                .returning(Document.id)
             )
-
-            # Add processing tags
-            if status == "completed" and stats:
-                await self._add_processing_tags(document_id, stats)
+            updated_id = result.scalar_one_or_none()
 
             await self.db.commit()
 
-            rows_updated = result.rowcount
-            if rows_updated > 0:
+            if updated_id is not None:
                 logger.info(f"✅ Updated document {document_id} status to {status}")
                 return True
             else:
@@ -142,35 +224,6 @@ class DocumentService:
             await self.db.rollback()
             return False
 
-    async def _add_processing_tags(self, document_id: str, stats: Dict[str, Any]):
-        """Add processing-related tags to document."""
-        try:
-            # Get current document
-            result = await self.db.execute(
-                select(Document).where(Document.id == document_id)
-            )
-            document = result.scalar_one_or_none()
-
-            if not document:
-                return
-
-            # Prepare new tags
-            new_tags = list(document.tags or [])
-
-            # Add processed tag (skip technical extraction method tags)
-            if "processed" not in new_tags:
-                new_tags.append("processed")
-
-            # Update tags
-            await self.db.execute(
-                update(Document)
-                .where(Document.id == document_id)
-                .values(tags=new_tags)
-            )
-
-        except Exception as e:
-            logger.error(f"Error adding processing tags: {e}")
-
     async def delete_document(self, document_id: str, user_id: str) -> bool:
         """Delete document and all related data."""
         try:
@@ -232,59 +285,98 @@ class DocumentService:
         self,
         document_id: str,
         user_id: str,
-        page: Optional[int] = None
+        page: Optional[int] = None,
+        include_chunks: bool = True
     ) -> Optional[Dict[str, Any]]:
-        """Get document content from chunks."""
+        """
+        Get document content from chunks.
+
+        Ownership check, chunk fetch and page count run as one statement:
+        the document is outer-joined to its chunks, so a missing/foreign
+        document yields no rows while a document without chunks yields one.
+        With include_chunks=False the content is concatenated in Postgres
+        (string_agg ordered by chunk_index) and no per-chunk data is loaded.
+        """
         try:
-            # Verify document ownership
-            document = await self.get_document(document_id, user_id)
-            if not document:
-                return None
-
-            # Get chunks for the document
-            query = select(DocumentChunk).where(DocumentChunk.document_id == document_id)
+            chunk_join = [DocumentChunk.document_id == Document.id]
 
             # Filter by page if specified
             if page is not None:
                 # Handle case where page_number might be NULL and page=1 is requested
                 if page == 1:
-                    query = query.where(
+                    chunk_join.append(
                         (DocumentChunk.page_number == page) |
                         (DocumentChunk.page_number.is_(None))
                     )
                 else:
-                    query = query.where(DocumentChunk.page_number == page)
+                    chunk_join.append(DocumentChunk.page_number == page)
 
-            query = query.order_by(DocumentChunk.chunk_index)
-
-            result = await self.db.execute(query)
-            chunks = result.scalars().all()
+            # Total pages count across the whole document
+            total_pages = (
+                select(func.count(func.distinct(DocumentChunk.page_number)))
+                .where(DocumentChunk.document_id == document_id)
+                .scalar_subquery()
+            )
+            owner_filter = (Document.id == document_id, Document.user_id == user_id)
 
-            # Combine chunk content
-            content_parts = []
             chunk_data = []
+            if include_chunks:
+                result = await self.db.execute(
+                    select(DocumentChunk, total_pages)
+                    .select_from(Document)
+                    .outerjoin(DocumentChunk, and_(*chunk_join))
+                    .where(*owner_filter)
+                    .order_by(DocumentChunk.chunk_index)
+                )
+                rows = result.all()
+
+                # Verify document ownership
+                if not rows:
+                    return None
+
+                # Combine chunk content
+                content_parts = []
+                page_total = rows[0][1]
+
+                for chunk, _ in rows:
+                    if chunk is None:
+                        continue
+                    content_parts.append(chunk.content)
+                    chunk_data.append({
+                        "id": chunk.id,
+                        "content": chunk.content,
+                        "page_number": chunk.page_number,
+                        "chunk_index": chunk.chunk_index
+                    })
+
+                content = "\n\n".join(content_parts)
+            else:
+                # Aggregate content server-side in chunk order
+                result = await self.db.execute(
+                    select(
+                        func.string_agg(
+                            DocumentChunk.content,
+                            aggregate_order_by(literal("\n\n"), DocumentChunk.chunk_index)
+                        ),
+                        total_pages
+                    )
+                    .select_from(Document)
+                    .outerjoin(DocumentChunk, and_(*chunk_join))
+                    .where(*owner_filter)
+                    .group_by(Document.id)
+                )
+                row = result.first()
 
-            for chunk in chunks:
-                content_parts.append(chunk.content)
-                chunk_data.append({
-                    "id": chunk.id,
-                    "content": chunk.content,
-                    "page_number": chunk.page_number,
-                    "chunk_index": chunk.chunk_index
-                })
+                # Verify document ownership
+                if row is None:
+                    return None
 
-            # Get total pages count
-            total_pages_result = await self.db.execute(
-                select(DocumentChunk.page_number)
-                .where(DocumentChunk.document_id == document_id)
-                .distinct()
-            )
-            total_pages = len(total_pages_result.fetchall())
+                content, page_total = row[0] or "", row[1]
 
             return {
-                "content": "\n\n".join(content_parts),
+                "content": content,
                 "chunks": chunk_data,
-                "total_pages": total_pages or 1
+                "total_pages": page_total or 1
             }
 
         except Exception as e:
@@ -331,12 +423,17 @@ class DocumentService:
             # Convert to dict format
             chunk_data = []
             for chunk in chunks:
+                embedding = chunk.embedding
+                scale = (chunk.chunk_metadata or {}).get("embedding_scale")
+                if embedding and scale is not None:
+                    # Stored as int8 levels; dequantize for callers
+                    embedding = [value * scale for value in embedding]
                 chunk_data.append({
                     "id": chunk.id,
                     "content": chunk.content,
                     "page_number": chunk.page_number,
                     "chunk_index": chunk.chunk_index,
-                    "embedding": chunk.embedding,
+                    "embedding": embedding,
                     "metadata": chunk.chunk_metadata
                 })
 
@@ -3,10 +3,56 @@ Monitoring service for metrics and observability.
 """
 
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import List, Optional
 
 logger = logging.getLogger(__name__)
 
+# Background listener that writes root log records off the event loop
+_log_listener: Optional[QueueListener] = None
+_root_handlers: List[logging.Handler] = []
+
 async def setup_monitoring():
     """Setup monitoring services."""
     logger.info("Monitoring setup completed")
     return True
+
+def start_queue_logging() -> None:
+    """
+    Move the root logger's handlers onto a background thread.
+
+    Logging calls only enqueue the record (QueueHandler); a QueueListener
+    thread performs the stream/file writes, so they never block the event loop.
+    """
+    global _log_listener, _root_handlers
+    if _log_listener is not None:
+        return
+
+    root = logging.getLogger()
+    _root_handlers = root.handlers[:]
+    for handler in _root_handlers:
+        root.removeHandler(handler)
+
+    log_queue = queue.SimpleQueue()
+    root.addHandler(QueueHandler(log_queue))
+    # Without configured handlers, stand in for logging's last-resort stderr output
+    handlers = _root_handlers or [logging.StreamHandler()]
+    _log_listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _log_listener.start()
+
+def stop_queue_logging() -> None:
+    """Flush queued records and give the root logger its handlers back."""
+    global _log_listener
+    if _log_listener is None:
+        return
+
+    _log_listener.stop()
+    _log_listener = None
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        if isinstance(handler, QueueHandler):
+            root.removeHandler(handler)
+    for handler in _root_handlers:
+        root.addHandler(handler)
@@ -2,98 +2,136 @@
  User service for authentication and user management.
 """
 
+import asyncio
 import logging
 import re
+import string
 from datetime import datetime, timedelta
 from typing import Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_
+from sqlalchemy import select, or_, bindparam, exists, func, lambda_stmt
+from sqlalchemy.exc import IntegrityError
 import bcrypt
 import secrets
 
-from api.models.users import User
+from api.models.users import User, hash_token
 from api.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Password character classes: translating a password through this table maps
+# every character of a class to its marker, so one C-level pass tells which
+# classes are present. Unmapped characters cannot collide with the markers
+# because the markers themselves are uppercase letters.
+_SPECIAL_CHARACTERS = '!@#$%^&*(),.?":{}|<>'
+_CLASS_TABLE = str.maketrans(
+    {c: 'U' for c in string.ascii_uppercase}
+    | {c: 'L' for c in string.ascii_lowercase}
+    | {c: 'D' for c in string.digits}
+    | {c: 'S' for c in _SPECIAL_CHARACTERS}
+)
+
+# Cached user lookups: compiled once, only the parameters are rebound per call
+_GET_USER_BY_EMAIL = lambda_stmt(
+    lambda: select(User).where(func.lower(User.email) == bindparam("email"))
+)
+_USER_EMAIL_EXISTS = lambda_stmt(
+    lambda: select(exists().where(func.lower(User.email) == bindparam("email")))
+)
+_GET_USER_BY_ID = lambda_stmt(lambda: select(User).where(User.id == bindparam("user_id")))
+_GET_USER_BY_VERIFICATION_TOKEN = lambda_stmt(
+    lambda: select(User).where(User.email_verification_token == bindparam("token"))
+)
+_GET_USER_BY_RESET_TOKEN = lambda_stmt(
+    lambda: select(User).where(User.password_reset_token == bindparam("token"))
+)
+
+# Basic email format
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+# Disposable email domains (basic list)
+_DISPOSABLE_DOMAINS: frozenset[str] = frozenset({
+    '10minutemail.com', 'tempmail.org', 'guerrillamail.com',
+    'mailinator.com', 'throwaway.email', 'temp-mail.org'
+})
+
+# Hash checked when a login email is unknown, so failed lookups take as long
+# as a real password check and do not reveal whether an account exists
+_DUMMY_HASH = bcrypt.hashpw(b'thinkdocs-dummy-password', bcrypt.gensalt(rounds=settings.security.bcrypt_rounds))
+
+# Three or more repeated characters
+_RE_REPEATED = re.compile(r'(.)\1{2,}')
+
+
+def _has_sequence(s: str) -> bool:
+    """Check a lowercased string for three ascending letters (abc..xyz) or digits (123..890)."""
+    for i in range(len(s) - 2):
+        first = s[i]
+        if 'a' <= first <= 'x' or '1' <= first <= '7':
+            code = ord(first)
+            if ord(s[i + 1]) == code + 1 and ord(s[i + 2]) == code + 2:
+                return True
+    return '890' in s
+
+
+def validate_password(password: str) -> Tuple[bool, str]:
+    """
+    Validate password strength.
+
+    Returns:
+        (is_valid, error_message)
+    """
+    if len(password) < 8:
+        return False, "Password must be at least 8 characters long"
+
+    if len(password) > 128:
+        return False, "Password must be less than 128 characters"
+
+    classes = set(password.translate(_CLASS_TABLE))
+
+    # Check for at least one uppercase letter
+    if 'U' not in classes:
+        return False, "Password must contain at least one uppercase letter"
+
+    # Check for at least one lowercase letter
+    if 'L' not in classes:
+        return False, "Password must contain at least one lowercase letter"
+
+    # Check for at least one digit
+    if 'D' not in classes:
+        return False, "Password must contain at least one number"
+
+    # Check for at least one special character
+    if 'S' not in classes:
+        return False, "Password must contain at least one special character (!@#$%^&*(),.?\":{}|<>)"
+
+    # Check for common weak patterns
+    lowered = password.lower()
+    if _RE_REPEATED.search(lowered) or _has_sequence(lowered):
+        return False, "Password contains weak patterns. Please use a more complex password"
+
+    return True, ""
+
+
+def validate_email(email: str) -> Tuple[bool, str]:
+    """
+    Validate email format and domain.
+
+    Returns:
+        (is_valid, error_message)
+    """
+    if not email or len(email) > 255:
+        return False, "Email address is required and must be less than 255 characters"
+
+    if not _EMAIL_RE.match(email):
+        return False, "Please enter a valid email address"
+
+    # Check for disposable email domains
+    domain = email.split('@')[1].lower()
+    if domain in _DISPOSABLE_DOMAINS:
+        return False, "Disposable email addresses are not allowed"
 
-class PasswordValidator:
-    """Production-grade password validation."""
-
-    @staticmethod
-    def validate_password(password: str) -> Tuple[bool, str]:
-        """
-        Validate password strength.
-
-        Returns:
-            (is_valid, error_message)
-        """
-        if len(password) < 8:
-            return False, "Password must be at least 8 characters long"
-
-        if len(password) > 128:
-            return False, "Password must be less than 128 characters"
-
-        # Check for at least one uppercase letter
-        if not re.search(r'[A-Z]', password):
-            return False, "Password must contain at least one uppercase letter"
-
-        # Check for at least one lowercase letter
-        if not re.search(r'[a-z]', password):
-            return False, "Password must contain at least one lowercase letter"
-
-        # Check for at least one digit
-        if not re.search(r'\d', password):
-            return False, "Password must contain at least one number"
-
-        # Check for at least one special character
-        if not re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
-            return False, "Password must contain at least one special character (!@#$%^&*(),.?\":{}|<>)"
-
-        # Check for common weak patterns
-        weak_patterns = [
-            r'(.)\1{2,}',  # Three or more repeated characters
-            r'123|234|345|456|567|678|789|890',  # Sequential numbers
-            r'abc|bcd|cde|def|efg|fgh|ghi|hij|ijk|jkl|klm|lmn|mno|nop|opq|pqr|qrs|rst|stu|tuv|uvw|vwx|wxy|xyz',  # Sequential letters
-        ]
-
-        for pattern in weak_patterns:
-            if re.search(pattern, password.lower()):
-                return False, "Password contains weak patterns. Please use a more complex password"
-
-        return True, ""
-
-
-class EmailValidator:
-    """Production-grade email validation."""
-
-    @staticmethod
-    def validate_email(email: str) -> Tuple[bool, str]:
-        """
-        Validate email format and domain.
-
-        Returns:
-            (is_valid, error_message)
-        """
-        if not email or len(email) > 255:
-            return False, "Email address is required and must be less than 255 characters"
-
-        # Basic email regex pattern
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if not re.match(email_pattern, email):
-            return False, "Please enter a valid email address"
-
-        # Check for disposable email domains (basic list)
-        disposable_domains = {
-            '10minutemail.com', 'tempmail.org', 'guerrillamail.com',
-            'mailinator.com', 'throwaway.email', 'temp-mail.org'
-        }
-
-        domain = email.split('@')[1].lower()
-        if domain in disposable_domains:
-            return False, "Disposable email addresses are not allowed"
-
-        return True, ""
+    return True, ""
 
 
 class UserService:
@@ -101,8 +139,6 @@ class UserService:
 
     def __init__(self, db_session: AsyncSession):
         self.db = db_session
-        self.password_validator = PasswordValidator()
-        self.email_validator = EmailValidator()
 
     async def register_user(
         self,
@@ -121,12 +157,12 @@ class UserService:
         """
         try:
             # Validate email
-            email_valid, email_error = self.email_validator.validate_email(email)
+            email_valid, email_error = validate_email(email)
             if not email_valid:
                 return None, email_error
 
             # Validate password
-            password_valid, password_error = self.password_validator.validate_password(password)
+            password_valid, password_error = validate_password(password)
             if not password_valid:
                 return None, password_error
 
@@ -138,12 +174,12 @@ class UserService:
                 return None, "Name must be less than 255 characters"
 
             # Check if user already exists
-            existing_user = await self.get_user_by_email(email)
-            if existing_user:
+            email_taken = await self.db.scalar(_USER_EMAIL_EXISTS, {"email": email.strip().lower()})
+            if email_taken:
                 return None, "An account with this email already exists"
 
             # Create password hash
-            password_hash = self._hash_password(password)
+            password_hash = await self._hash_password(password)
 
             # Create new user
             user = User(
@@ -165,6 +201,11 @@ class UserService:
             logger.info(f"User registered successfully: {user.email}")
             return user, ""
 
+        except IntegrityError:
+            # Concurrent registration won the race on the unique email index
+            await self.db.rollback()
+            return None, "An account with this email already exists"
+
         except Exception as e:
             logger.error(f"Registration failed: {e}")
             await self.db.rollback()
@@ -181,6 +222,7 @@ class UserService:
             # Get user by email
             user = await self.get_user_by_email(email)
             if not user:
+                await asyncio.to_thread(bcrypt.checkpw, password.encode('utf-8'), _DUMMY_HASH)
                 return None, "Invalid email or password"
 
             # Check if account is locked
@@ -192,7 +234,7 @@ class UserService:
                 return None, "Account is deactivated. Please contact support."
 
             # Verify password
-            if not self._verify_password(password, user.password_hash):
+            if not await self._verify_password(password, user.password_hash):
                 # Increment failed login attempts
                 user.increment_failed_login(
                     max_attempts=settings.security.max_login_attempts,
@@ -218,7 +260,7 @@ class UserService:
         """Get user by email address."""
         try:
             result = await self.db.execute(
-                select(User).where(User.email == email.lower().strip())
+                _GET_USER_BY_EMAIL, {"email": email.strip().lower()}
             )
             return result.scalar_one_or_none()
         except Exception as e:
@@ -228,9 +270,7 @@ class UserService:
     async def get_user_by_id(self, user_id: str) -> Optional[User]:
         """Get user by ID."""
         try:
-            result = await self.db.execute(
-                select(User).where(User.id == user_id)
-            )
+            result = await self.db.execute(_GET_USER_BY_ID, {"user_id": user_id})
             return result.scalar_one_or_none()
         except Exception as e:
             logger.error(f"Error getting user by ID: {e}")
@@ -239,9 +279,7 @@ class UserService:
     async def verify_email(self, token: str) -> Tuple[bool, str]:
         """Verify user email with token."""
         try:
-            result = await self.db.execute(
-                select(User).where(User.email_verification_token == token)
-            )
+            result = await self.db.execute(_GET_USER_BY_VERIFICATION_TOKEN, {"token": hash_token(token)})
             user = result.scalar_one_or_none()
 
             if not user:
@@ -287,14 +325,12 @@ class UserService:
         """Reset user password with token."""
         try:
             # Validate new password
-            password_valid, password_error = self.password_validator.validate_password(new_password)
+            password_valid, password_error = validate_password(new_password)
             if not password_valid:
                 return False, password_error
 
             # Find user with reset token
-            result = await self.db.execute(
-                select(User).where(User.password_reset_token == token)
-            )
+            result = await self.db.execute(_GET_USER_BY_RESET_TOKEN, {"token": hash_token(token)})
             user = result.scalar_one_or_none()
 
             if not user:
@@ -304,7 +340,7 @@ class UserService:
                 return False, "Reset token has expired"
 
             # Update password
-            user.password_hash = self._hash_password(new_password)
+            user.password_hash = await self._hash_password(new_password)
             user.last_password_change = datetime.utcnow()
             user.clear_password_reset_token()
             user.failed_login_attempts = 0
@@ -319,15 +355,18 @@ class UserService:
             logger.error(f"Password reset failed: {e}")
             return False, "Password reset failed"
 
-    def _hash_password(self, password: str) -> str:
-        """Hash password using bcrypt."""
-        salt = bcrypt.gensalt(rounds=12)  # Production-grade rounds
-        return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+    async def _hash_password(self, password: str) -> str:
+        """Hash password using bcrypt in a worker thread."""
+        salt = bcrypt.gensalt(rounds=settings.security.bcrypt_rounds)
+        password_hash = await asyncio.to_thread(bcrypt.hashpw, password.encode('utf-8'), salt)
+        return password_hash.decode('utf-8')
 
-    def _verify_password(self, password: str, password_hash: str) -> bool:
-        """Verify password against hash."""
+    async def _verify_password(self, password: str, password_hash: str) -> bool:
+        """Verify password against hash in a worker thread."""
         try:
-            return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+            return await asyncio.to_thread(
+                bcrypt.checkpw, password.encode('utf-8'), password_hash.encode('utf-8')
+            )
         except Exception as e:
             logger.error(f"Password verification error: {e}")
             return False
@@ -3,8 +3,28 @@ Vector database service for ThinkDocs using ChromaDB.
 Handles document embeddings, similarity search, and vector operations.
 """
 
+import asyncio
+import json
 import logging
-from typing import List, Dict, Any, Optional
+import time
+import types
+import uuid
+from itertools import repeat
+from typing import List, Dict, Any, Optional, Tuple
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
 
 try:
     import chromadb
@@ -14,17 +34,239 @@ except ImportError:
     CHROMADB_AVAILABLE = False
 
 from api.config import settings
+from model.embeddings.service import quantize_int8_rows
 
 logger = logging.getLogger(__name__)
 
+
+def _use_orjson_for_chroma_responses():
+    """Make chromadb's HTTP client decode responses with orjson."""
+    if not (CHROMADB_AVAILABLE and ORJSON_AVAILABLE):
+        return
+    try:
+        from chromadb.api import fastapi as chroma_http
+    except ImportError:
+        return
+    # Only replace the stdlib module; newer chromadb releases already use orjson
+    if getattr(chroma_http, "json", None) is json:
+        fast_json = types.ModuleType("json")
+        fast_json.__dict__.update(json.__dict__)
+        fast_json.loads = orjson.loads
+        chroma_http.json = fast_json
+
+
+_use_orjson_for_chroma_responses()
+
+COLLECTION_NAME = "thinkdocs_documents"
+BINARY_COLLECTION_NAME = f"{COLLECTION_NAME}_binary"
+
+# HNSW index parameters applied when the collection is first created
+HNSW_METADATA = {
+    "hnsw:space": "cosine",
+    "hnsw:M": 32,
+    "hnsw:construction_ef": 200,
+    "hnsw:search_ef": 100,
+}
+
+# Fields returned by similarity queries; embeddings are never needed here
+QUERY_INCLUDE = ["documents", "metadatas", "distances"]
+
+# ID deletes above this size are split into concurrent chunks
+DELETE_CHUNK_THRESHOLD = 1000
+DELETE_CHUNK_SIZE = 500
+
+# Collection stats are best-effort; serve a cached count for a few seconds
+STATS_CACHE_TTL = 5.0
+
 # Global ChromaDB client
 _chroma_client = None
 _collection = None
+_binary_collection = None
+_stats_cache: Dict[str, Any] = {"value": None, "ts": 0.0}
+
+# Embedding model used for query vectors (set by the API at startup)
+_query_embedder = None
+
+
+async def _call(method, *args, **kwargs):
+    """Invoke a client/collection method, awaiting async ones and threading sync ones."""
+    if asyncio.iscoroutinefunction(method):
+        return await method(*args, **kwargs)
+    return await asyncio.to_thread(method, *args, **kwargs)
+
+
+def set_query_embedder(embedding_service) -> None:
+    """
+    Embed search queries with this service instead of ChromaDB's default model.
+
+    It should be the same model that produced the stored vectors.
+    """
+    global _query_embedder
+    _query_embedder = embedding_service
+
+
+def _normalize_query(query: str) -> str:
+    """
+    Normalize query whitespace so trivially different queries share a cache entry.
+
+    Case is kept: cased embedding models give different vectors for it.
+    """
+    return " ".join(query.split())
+
+
+async def _query_embeddings(queries: List[str]) -> Optional[List[List[float]]]:
+    """
+    Embed queries with the query embedder, or None to let ChromaDB do it.
+
+    Goes through the service's async API, so query encodes share its single
+    batcher with document encodes and repeats hit its embedding cache.
+    Encoding errors propagate (strict=True) rather than yielding mock vectors.
+    """
+    if _query_embedder is None or not _query_embedder.is_available():
+        return None
+    normalized = [_normalize_query(query) for query in queries]
+    return await _query_embedder.embed_texts(normalized, strict=True)
+
+
+def _invalidate_stats_cache():
+    """Force the next get_collection_stats call to hit ChromaDB."""
+    _stats_cache["ts"] = 0.0
+
+
+def quantize_int8(embeddings: List[List[float]]) -> Tuple[List[List[int]], List[float]]:
+    """
+    Quantize embeddings to int8 levels, one scale per vector.
+
+    Returns the quantized vectors and their scales; multiply by a scale to
+    dequantize (see model.embeddings.service.quantize_int8_rows, shared with
+    the PostgreSQL chunk embeddings). Cosine similarity is scale-invariant,
+    so the quantized vectors can be searched directly in a cosine-space
+    collection.
+
+    ChromaDB still stores every vector as float32, so this saves no storage;
+    the gain is only the smaller JSON request payload.
+    """
+    if not NUMPY_AVAILABLE or not len(embeddings):
+        return embeddings, [1.0] * len(embeddings)
+
+    quantized, scales = quantize_int8_rows(embeddings)
+    return quantized.tolist(), scales.tolist()
 
 
-async def setup_chromadb():
-    """Initialize ChromaDB client and collection."""
-    global _chroma_client, _collection
+def binarize(embeddings: List[List[float]]) -> List[List[float]]:
+    """Reduce embeddings to their sign pattern (+1/-1) for coarse candidate search."""
+    return np.where(np.asarray(embeddings) > 0, 1.0, -1.0).tolist()
+
+
+def _rerank(
+    query_embedding: List[float],
+    candidates: Dict[str, Any],
+    n_results: int
+) -> List[Dict[str, Any]]:
+    """Re-rank fetched candidates by exact cosine distance to the query."""
+    ids = candidates.get('ids') or []
+    if not ids:
+        return []
+
+    query = np.asarray(query_embedding, dtype=np.float32)
+    vectors = np.asarray(candidates['embeddings'], dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1) * np.linalg.norm(query)
+    distances = 1.0 - np.einsum('d,nd->n', query, vectors) / np.maximum(norms, 1e-12)
+    top = np.argsort(distances)[:n_results]
+
+    documents = candidates.get('documents') or [None] * len(ids)
+    metadatas = candidates.get('metadatas') or [{}] * len(ids)
+    return [
+        {
+            'document': documents[i],
+            'metadata': metadatas[i],
+            'distance': float(distances[i]),
+            'id': ids[i]
+        }
+        for i in top
+    ]
+
+
+def _format_query_results(results: Dict[str, Any], index: int) -> List[Dict[str, Any]]:
+    """Format the hits for one query of a ChromaDB query response."""
+    documents = results.get('documents')
+    if not documents:
+        return []
+
+    # Resolve each column once, then fuse with zip.
+    # Missing columns fall back to per-result defaults.
+    def column(key: str, default: Any):
+        values = results.get(key)
+        return values[index] if values else repeat(default)
+
+    return [
+        {'document': doc, 'metadata': meta, 'distance': dist, 'id': doc_id}
+        for doc, meta, dist, doc_id in zip(
+            documents[index],
+            column('metadatas', {}),
+            column('distances', 0.0),
+            column('ids', None),
+        )
+    ]
+
+
+async def _get_or_create_collection(name: str, description: str):
+    """Open a collection, creating it with the tuned HNSW params if missing."""
+    try:
+        collection = await _call(_chroma_client.get_collection, name=name)
+        logger.info(f"Using existing ChromaDB collection: {name}")
+    except Exception:
+        collection = await _call(
+            _chroma_client.create_collection,
+            name=name,
+            metadata={"description": description, **HNSW_METADATA}
+        )
+        logger.info(f"Created new ChromaDB collection: {name}")
+    return collection
+
+
+def _get_or_create_collection_sync(client, name: str, description: str):
+    """Blocking variant of _get_or_create_collection for sync clients."""
+    try:
+        collection = client.get_collection(name=name)
+        logger.info(f"Using existing ChromaDB collection: {name}")
+    except Exception:
+        collection = client.create_collection(
+            name=name,
+            metadata={"description": description, **HNSW_METADATA}
+        )
+        logger.info(f"Created new ChromaDB collection: {name}")
+    return collection
+
+
+def _connect_sync():
+    """Connect a sync HttpClient and open the collections (blocking)."""
+    client = chromadb.HttpClient(
+        host=settings.vector_db.chromadb_host,
+        port=settings.vector_db.chromadb_port
+    )
+    collection = _get_or_create_collection_sync(
+        client, COLLECTION_NAME, "ThinkDocs document embeddings"
+    )
+    binary_collection = None
+    if settings.vector_db.chromadb_two_stage_search and NUMPY_AVAILABLE:
+        binary_collection = _get_or_create_collection_sync(
+            client, BINARY_COLLECTION_NAME, "Sign-binarized ThinkDocs embeddings for candidate search"
+        )
+    return client, collection, binary_collection
+
+
+async def setup_chromadb(use_async_client: bool = False):
+    """
+    Initialize ChromaDB client and collection.
+
+    Args:
+        use_async_client: Use chromadb.AsyncHttpClient (chromadb >= 0.5) so
+            requests run natively on the event loop over pooled keep-alive
+            connections. Only for the long-lived server loop; processes that
+            run short-lived loops (Celery workers) keep the sync client.
+    """
+    global _chroma_client, _collection, _binary_collection
 
     if not CHROMADB_AVAILABLE:
         logger.warning("ChromaDB not available - using mock implementation")
@@ -33,24 +275,20 @@ async def setup_chromadb():
     if _chroma_client is None:
         try:
             # Create ChromaDB client
-            _chroma_client = chromadb.HttpClient(
-                host=settings.vector_db.chromadb_host,
-                port=settings.vector_db.chromadb_port
-            )
-
-            # Get or create collection
-            collection_name = "thinkdocs_documents"
-            try:
-                _collection = _chroma_client.get_collection(
-                    name=collection_name
+            if use_async_client and hasattr(chromadb, "AsyncHttpClient"):
+                _chroma_client = await chromadb.AsyncHttpClient(
+                    host=settings.vector_db.chromadb_host,
+                    port=settings.vector_db.chromadb_port
                 )
-                logger.info(f"Using existing ChromaDB collection: {collection_name}")
-            except Exception:
-                _collection = _chroma_client.create_collection(
-                    name=collection_name,
-                    metadata={"description": "ThinkDocs document embeddings"}
+                _collection = await _get_or_create_collection(
+                    COLLECTION_NAME, "ThinkDocs document embeddings"
                 )
-                logger.info(f"Created new ChromaDB collection: {collection_name}")
+                if settings.vector_db.chromadb_two_stage_search and NUMPY_AVAILABLE:
+                    _binary_collection = await _get_or_create_collection(
+                        BINARY_COLLECTION_NAME, "Sign-binarized ThinkDocs embeddings for candidate search"
+                    )
+            else:
+                _chroma_client, _collection, _binary_collection = await asyncio.to_thread(_connect_sync)
 
             logger.info("ChromaDB connection established successfully")
 
@@ -59,6 +297,7 @@ async def setup_chromadb():
             # Don't raise, just log and continue with None
             _chroma_client = None
             _collection = None
+            _binary_collection = None
 
     return _chroma_client
 
@@ -81,8 +320,13 @@ class VectorDBService:
     """ChromaDB vector database service with fallback."""
 
     def __init__(self):
-        self.client = None
-        self.collection = None
+        # Preload the module-level client/collection when already set up
+        self.client = _chroma_client
+        self.collection = _collection
+        self.binary_collection = _binary_collection
+        # Blocking client for add_documents_sync, opened on first use
+        self._sync_collection = None
+        self._sync_binary_collection = None
 
     async def _get_client(self):
         """Get ChromaDB client."""
@@ -94,8 +338,92 @@ class VectorDBService:
         """Get ChromaDB collection."""
         if self.collection is None:
             self.collection = await get_collection()
+            self.binary_collection = _binary_collection
         return self.collection
 
+    @staticmethod
+    def _iter_batches(
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+        embeddings,
+        ids: Optional[List[str]],
+        with_binary: bool
+    ):
+        """Yield (add kwargs, binarized embeddings or None) per upload batch."""
+        # Generate IDs if not provided
+        if ids is None:
+            # Positional ids ("doc_0", ...) collided across calls and
+            # silently overwrote earlier vectors
+            ids = [uuid.uuid4().hex for _ in documents]
+
+        batch_size = settings.vector_db.chromadb_batch_size
+        quantize = settings.vector_db.chromadb_quantize_int8
+
+        for start in range(0, len(documents), batch_size):
+            end = start + batch_size
+            batch_embeddings = embeddings[start:end]
+            if hasattr(batch_embeddings, "tolist"):
+                # numpy input: only this batch is boxed for the JSON request
+                batch_embeddings = batch_embeddings.tolist()
+            binary_embeddings = binarize(batch_embeddings) if with_binary else None
+            batch_metadatas = metadatas[start:end]
+            if quantize:
+                # Integer levels serialize far smaller than full floats (payload
+                # only; ChromaDB stores float32 regardless)
+                batch_embeddings, scales = quantize_int8(batch_embeddings)
+                batch_metadatas = [
+                    {**meta, "embedding_scale": scale} for meta, scale in zip(batch_metadatas, scales)
+                ]
+            yield {
+                "documents": documents[start:end],
+                "embeddings": batch_embeddings,
+                "metadatas": batch_metadatas,
+                "ids": ids[start:end],
+            }, binary_embeddings
+
+    def add_documents_sync(
+        self,
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+        embeddings,
+        ids: Optional[List[str]] = None
+    ) -> bool:
+        """
+        Add documents through a blocking client, without an event loop.
+
+        For Celery workers, which have no running loop; uploads batches
+        sequentially over the client's kept-alive connection.
+        """
+        if embeddings is None:
+            raise ValueError("embeddings required")
+        if len(embeddings) != len(documents):
+            raise ValueError(f"Embedding count mismatch: {len(embeddings)} != {len(documents)}")
+
+        try:
+            if self._sync_collection is None:
+                _, self._sync_collection, self._sync_binary_collection = _connect_sync()
+            collection = self._sync_collection
+            binary_collection = self._sync_binary_collection
+
+            for batch, binary_embeddings in self._iter_batches(
+                documents, metadatas, embeddings, ids, binary_collection is not None
+            ):
+                collection.add(**batch)
+                if binary_collection is not None:
+                    binary_collection.add(
+                        ids=batch["ids"],
+                        embeddings=binary_embeddings,
+                        metadatas=batch["metadatas"]
+                    )
+            _invalidate_stats_cache()
+
+            logger.info(f"Added {len(documents)} documents to ChromaDB")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error adding documents to ChromaDB: {e}")
+            return False
+
     async def add_documents(
         self,
         documents: List[str],
@@ -103,10 +431,17 @@ class VectorDBService:
         embeddings: Optional[List[List[float]]] = None,
         ids: Optional[List[str]] = None
     ) -> bool:
-        """Add documents to the vector database."""
-        if not CHROMADB_AVAILABLE:
-            logger.info("ChromaDB not available - skipping document addition")
-            return True
+        """
+        Add documents to the vector database.
+
+        Embeddings are required: letting ChromaDB embed server-side runs its
+        default model inline with every insert. Use embed_and_add_documents
+        to compute them first.
+        """
+        if embeddings is None:
+            raise ValueError("embeddings required")
+        if len(embeddings) != len(documents):
+            raise ValueError(f"Embedding count mismatch: {len(embeddings)} != {len(documents)}")
 
         try:
             collection = await self._get_collection()
@@ -114,25 +449,29 @@ class VectorDBService:
                 logger.warning("ChromaDB collection not available")
                 return False
 
-            # Generate IDs if not provided
-            if ids is None:
-                ids = [f"doc_{i}" for i in range(len(documents))]
-
-            # Add documents to collection
-            if embeddings:
-                collection.add(
-                    documents=documents,
-                    metadatas=metadatas,
-                    embeddings=embeddings,
-                    ids=ids
-                )
-            else:
-                # ChromaDB will generate embeddings automatically
-                collection.add(
-                    documents=documents,
-                    metadatas=metadatas,
-                    ids=ids
+            # Upload in bounded batches so each HTTP request stays small;
+            # a few batches may be in flight at once
+            semaphore = asyncio.Semaphore(settings.vector_db.chromadb_max_concurrent_batches)
+            binary_collection = self.binary_collection
+
+            async def add_batch(batch: Dict[str, Any], binary_embeddings):
+                async with semaphore:
+                    await _call(collection.add, **batch)
+                    if binary_collection is not None:
+                        await _call(
+                            binary_collection.add,
+                            ids=batch["ids"],
+                            embeddings=binary_embeddings,
+                            metadatas=batch["metadatas"]
+                        )
+
+            await asyncio.gather(*(
+                add_batch(batch, binary_embeddings)
+                for batch, binary_embeddings in self._iter_batches(
+                    documents, metadatas, embeddings, ids, binary_collection is not None
                 )
+            ))
+            _invalidate_stats_cache()
 
             logger.info(f"Added {len(documents)} documents to ChromaDB")
             return True
@@ -145,57 +484,170 @@ class VectorDBService:
         self,
         query: str,
         n_results: int = 5,
-        where: Optional[Dict[str, Any]] = None
+        where: Optional[Dict[str, Any]] = None,
+        query_embedding: Optional[List[float]] = None
     ) -> List[Dict[str, Any]]:
-        """Search for similar documents."""
-        if not CHROMADB_AVAILABLE:
-            logger.info("ChromaDB not available - returning empty results")
-            return []
-
+        """
+        Search for similar documents.
+
+        Pass query_embedding (from the same model used at insert time) to skip
+        server-side query embedding; it is quantized like stored vectors.
+        Otherwise the query is embedded with the configured query embedder,
+        falling back to ChromaDB's embedding function.
+        """
         try:
             collection = await self._get_collection()
             if collection is None:
                 logger.warning("ChromaDB collection not available")
                 return []
 
-            results = collection.query(
-                query_texts=[query],
+            if query_embedding is None:
+                embedded = await _query_embeddings([query])
+                if embedded is not None:
+                    query_embedding = embedded[0]
+
+            if query_embedding is not None and self.binary_collection is not None:
+                return await self._two_stage_search(collection, query_embedding, n_results, where)
+
+            if query_embedding is not None:
+                if settings.vector_db.chromadb_quantize_int8:
+                    (query_embedding,), _ = quantize_int8([query_embedding])
+                query_args = {"query_embeddings": [query_embedding]}
+            else:
+                query_args = {"query_texts": [query]}
+
+            results = await _call(
+                collection.query,
                 n_results=n_results,
-                where=where
+                where=where,
+                include=QUERY_INCLUDE,
+                **query_args
             )
 
-            # Format results
-            formatted_results = []
-            if results.get('documents') and results['documents'][0]:
-                for i, doc in enumerate(results['documents'][0]):
-                    result = {
-                        'document': doc,
-                        'metadata': results['metadatas'][0][i] if results.get('metadatas') else {},
-                        'distance': results['distances'][0][i] if results.get('distances') else 0.0,
-                        'id': results['ids'][0][i] if results.get('ids') else None
-                    }
-                    formatted_results.append(result)
-
-            return formatted_results
+            return _format_query_results(results, 0)
 
         except Exception as e:
             logger.error(f"Error searching ChromaDB: {e}")
             return []
 
+    async def _two_stage_search(
+        self,
+        collection,
+        query_embedding: List[float],
+        n_results: int,
+        where: Optional[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Fetch binary candidates, then re-rank them with the stored full vectors."""
+        candidates = await _call(
+            self.binary_collection.query,
+            query_embeddings=binarize([query_embedding]),
+            n_results=n_results * settings.vector_db.chromadb_rerank_candidates,
+            where=where,
+            include=[]
+        )
+        candidate_ids = (candidates.get('ids') or [[]])[0]
+        if not candidate_ids:
+            return []
+
+        full = await _call(
+            collection.get,
+            ids=candidate_ids,
+            include=["embeddings", "documents", "metadatas"]
+        )
+        return _rerank(query_embedding, full, n_results)
+
+    async def search_similar_batch(
+        self,
+        queries: List[str],
+        n_results: int = 5,
+        where: Optional[Dict[str, Any]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """Search for similar documents for several queries in one request."""
+        if not queries:
+            return []
+
+        try:
+            collection = await self._get_collection()
+            if collection is None:
+                logger.warning("ChromaDB collection not available")
+                return [[] for _ in queries]
+
+            embedded = await _query_embeddings(queries)
+            if embedded is not None:
+                if settings.vector_db.chromadb_quantize_int8:
+                    embedded, _ = quantize_int8(embedded)
+                query_args = {"query_embeddings": embedded}
+            else:
+                query_args = {"query_texts": queries}
+
+            results = await _call(
+                collection.query,
+                n_results=n_results,
+                where=where,
+                include=QUERY_INCLUDE,
+                **query_args
+            )
+
+            return [_format_query_results(results, i) for i in range(len(queries))]
+
+        except Exception as e:
+            logger.error(f"Error batch searching ChromaDB: {e}")
+            return [[] for _ in queries]
+
     async def delete_documents(self, ids: List[str]) -> bool:
         """Delete documents by IDs."""
-        if not CHROMADB_AVAILABLE:
-            logger.info("ChromaDB not available - skipping document deletion")
+        try:
+            collection = await self._get_collection()
+            if collection is None:
+                logger.warning("ChromaDB collection not available")
+                return False
+
+            if len(ids) > DELETE_CHUNK_THRESHOLD:
+                chunks = [ids[i:i + DELETE_CHUNK_SIZE] for i in range(0, len(ids), DELETE_CHUNK_SIZE)]
+            else:
+                chunks = [ids]
+            semaphore = asyncio.Semaphore(settings.vector_db.chromadb_max_concurrent_batches)
+
+            async def delete_chunk(chunk_ids: List[str]):
+                async with semaphore:
+                    await _call(collection.delete, ids=chunk_ids)
+                    if self.binary_collection is not None:
+                        await _call(self.binary_collection.delete, ids=chunk_ids)
+
+            await asyncio.gather(*(delete_chunk(chunk) for chunk in chunks))
+            _invalidate_stats_cache()
+            logger.info(f"Deleted {len(ids)} documents from ChromaDB")
             return True
 
+        except Exception as e:
+            logger.error(f"Error deleting documents from ChromaDB: {e}")
+            return False
+
+    async def delete_where(self, where: Dict[str, Any], max_rounds: int = 10) -> bool:
+        """
+        Delete every document matching a metadata filter.
+
+        Repeats the filtered delete until the collection count stops
+        dropping, in case the server caps how many rows one call removes.
+        """
         try:
             collection = await self._get_collection()
             if collection is None:
                 logger.warning("ChromaDB collection not available")
                 return False
 
-            collection.delete(ids=ids)
-            logger.info(f"Deleted {len(ids)} documents from ChromaDB")
+            count = await _call(collection.count)
+            for _ in range(max_rounds):
+                await _call(collection.delete, where=where)
+                remaining = await _call(collection.count)
+                if remaining >= count:
+                    break
+                count = remaining
+
+            if self.binary_collection is not None:
+                await _call(self.binary_collection.delete, where=where)
+            _invalidate_stats_cache()
+            logger.info(f"Deleted documents matching {where} from ChromaDB")
             return True
 
         except Exception as e:
@@ -204,26 +656,79 @@ class VectorDBService:
 
     async def get_collection_stats(self) -> Dict[str, Any]:
         """Get collection statistics."""
-        if not CHROMADB_AVAILABLE:
-            return {"count": 0, "available": False}
-
         try:
             collection = await self._get_collection()
             if collection is None:
                 return {"count": 0, "available": False}
 
-            count = collection.count()
-            return {
+            now = time.monotonic()
+            if _stats_cache["value"] is not None and now - _stats_cache["ts"] < STATS_CACHE_TTL:
+                return _stats_cache["value"]
+
+            count = await _call(collection.count)
+            stats = {
                 "count": count,
                 "available": True,
-                "name": settings.chromadb.collection_name
+                "name": COLLECTION_NAME
             }
+            _stats_cache["value"] = stats
+            _stats_cache["ts"] = now
+            return stats
 
         except Exception as e:
             logger.error(f"Error getting collection stats: {e}")
             return {"count": 0, "available": False, "error": str(e)}
 
 
+
+class _NoopVectorDB(VectorDBService):
+    """Stand-in used when chromadb is not installed; every call is a no-op."""
+
+    def add_documents_sync(self, documents, metadatas, embeddings, ids=None) -> bool:
+        return True
+
+    async def add_documents(self, documents, metadatas, embeddings=None, ids=None) -> bool:
+        return True
+
+    async def search_similar(self, query, n_results=5, where=None, query_embedding=None) -> List[Dict[str, Any]]:
+        return []
+
+    async def search_similar_batch(self, queries, n_results=5, where=None) -> List[List[Dict[str, Any]]]:
+        return [[] for _ in queries]
+
+    async def delete_documents(self, ids) -> bool:
+        return True
+
+    async def delete_where(self, where, max_rounds=10) -> bool:
+        return True
+
+    async def get_collection_stats(self) -> Dict[str, Any]:
+        return {"count": 0, "available": False}
+
+
+if not CHROMADB_AVAILABLE:
+    logger.info("ChromaDB not available - vector operations are no-ops")
+    VectorDBService = _NoopVectorDB
+
+# Shared service instance
+_service_singleton: Optional[VectorDBService] = None
+_service_lock = asyncio.Lock()
+
+
+async def get_service() -> VectorDBService:
+    """Get the shared VectorDBService, connecting on first use."""
+    global _service_singleton
+
+    if _service_singleton is None:
+        async with _service_lock:
+            if _service_singleton is None:
+                service = VectorDBService()
+                await service._get_client()
+                await service._get_collection()
+                _service_singleton = service
+    return _service_singleton
+
+
 # Helper functions for backward compatibility
 async def add_documents(
     documents: List[str],
@@ -232,15 +737,38 @@ async def add_documents(
     ids: Optional[List[str]] = None
 ) -> bool:
     """Add documents to ChromaDB."""
-    service = VectorDBService()
+    service = await get_service()
     return await service.add_documents(documents, metadatas, embeddings, ids)
 
 
+async def embed_and_add_documents(
+    embedding_service,
+    documents: List[str],
+    metadatas: List[Dict[str, Any]],
+    ids: Optional[List[str]] = None,
+    batch_size: int = 32
+) -> bool:
+    """Embed documents in concurrent mini-batches, then add them to ChromaDB."""
+    embeddings = await embedding_service.embed_documents(documents, batch_size=batch_size)
+    return await add_documents(documents, metadatas, embeddings, ids)
+
+
 async def search_similar_documents(
     query: str,
     n_results: int = 5,
-    where: Optional[Dict[str, Any]] = None
+    where: Optional[Dict[str, Any]] = None,
+    query_embedding: Optional[List[float]] = None
 ) -> List[Dict[str, Any]]:
     """Search for similar documents."""
-    service = VectorDBService()
-    return await service.search_similar(query, n_results, where)
+    service = await get_service()
+    return await service.search_similar(query, n_results, where, query_embedding)
+
+
+async def search_similar_documents_batch(
+    queries: List[str],
+    n_results: int = 5,
+    where: Optional[Dict[str, Any]] = None
+) -> List[List[Dict[str, Any]]]:
+    """Search for similar documents for several queries at once."""
+    service = await get_service()
+    return await service.search_similar_batch(queries, n_results, where)
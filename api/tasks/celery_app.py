@@ -6,10 +6,22 @@ Handles background tasks like document processing and embedding generation.
 import os
 import logging
 from celery import Celery
+from celery.signals import worker_process_init
 from kombu import Queue
 
+try:
+    import msgpack  # noqa: F401 - kombu's msgpack serializer needs it
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Embedding payloads are large float lists; msgpack encodes each float in
+# 9 bytes instead of ~20 ASCII characters. JSON stays accepted so messages
+# queued by older producers still decode during rollout.
+TASK_SERIALIZER = "msgpack" if MSGPACK_AVAILABLE else "json"
+
 # PRODUCTION FIX: Robust configuration loading with fallbacks
 def get_celery_config():
     """
@@ -36,86 +48,128 @@ def get_celery_config():
             'debug': debug_mode
         }
 
-# Load configuration safely
-config = get_celery_config()
-
-# Create Celery instance with robust configuration
-celery_app = Celery(
-    "thinkdocs",
-    broker=config['broker_url'],
-    backend=config['result_backend'],
-    include=["api.tasks.document_tasks"]
-)
-
-# PRODUCTION CONFIGURATION: Comprehensive Celery settings
-celery_app.conf.update(
-    # Task routing - Production queue organization
-    task_routes={
-        "api.tasks.document_tasks.*": {"queue": "documents"},
-        "api.tasks.embedding_tasks.*": {"queue": "embeddings"},
-    },
-
-    # Queue configuration - Production-ready queues
-    task_default_queue="default",
-    task_queues=(
-        Queue("default", durable=True),
-        Queue("documents", durable=True),
-        Queue("embeddings", durable=True),
-    ),
-
-    # Task execution - Production reliability settings
-    task_always_eager=config['debug'],  # Only eager in debug mode
-    task_eager_propagates=True,
-    task_ignore_result=False,
-    result_expires=3600,  # 1 hour result retention
-
-    # PRODUCTION RELIABILITY: Advanced task configuration
-    task_acks_late=True,  # Acknowledge tasks only after completion
-    task_reject_on_worker_lost=True,  # Reject tasks when worker dies
-    task_track_started=True,  # Track task start events
-
-    # Worker configuration - Production performance
-    worker_prefetch_multiplier=1,  # One task at a time for reliability
-    worker_max_tasks_per_child=1000,  # Restart workers periodically
-    worker_disable_rate_limits=False,  # Enable rate limiting
-
-    # PRODUCTION RETRY POLICY: Intelligent retry handling
-    task_default_retry_delay=60,  # Wait 60s before retry
-    task_max_retries=3,  # Maximum 3 retries
-    task_soft_time_limit=300,  # 5 minute soft timeout
-    task_time_limit=360,  # 6 minute hard timeout
-
-    # Serialization - Production security
-    task_serializer="json",
-    accept_content=["json"],
-    result_serializer="json",
-    timezone="UTC",
-    enable_utc=True,
-
-    # PRODUCTION MONITORING: Comprehensive observability
-    worker_send_task_events=True,
-    task_send_sent_event=True,
-    worker_log_format="[%(asctime)s: %(levelname)s/%(processName)s] [CELERY] %(message)s",
-
-    # PRODUCTION ERROR HANDLING: Robust error management
-    task_annotations={
-        '*': {
-            'rate_limit': '10/s',  # 10 tasks per second max
-            'time_limit': 360,     # 6 minute timeout
-            'soft_time_limit': 300, # 5 minute soft timeout
+
+def make_celery() -> Celery:
+    """
+    Build the configured Celery application.
+
+    Construction does not open broker connections; each prefork child
+    connects after the fork (see _connect_after_fork), so no socket is
+    shared across processes.
+    """
+    # Load configuration safely
+    config = get_celery_config()
+
+    # Create Celery instance with robust configuration
+    app = Celery(
+        "thinkdocs",
+        broker=config['broker_url'],
+        backend=config['result_backend'],
+        include=["api.tasks.document_tasks", "api.tasks.embedding_tasks"]
+    )
+
+    # PRODUCTION CONFIGURATION: Comprehensive Celery settings
+    app.conf.update(
+        # Task routing - Production queue organization
+        task_routes={
+            "api.tasks.document_tasks.*": {"queue": "documents"},
+            "api.tasks.embedding_tasks.*": {"queue": "embeddings"},
+            "cleanup_file": {"queue": "cleanup"},
+        },
+
+        # Queue configuration - Production-ready queues
+        task_default_queue="default",
+        task_queues=(
+            Queue("default", durable=True),
+            Queue("documents", durable=True),
+            Queue("embeddings", durable=True),
+            Queue("cleanup", durable=True),
+        ),
+
+        # Task execution - Production reliability settings
+        # Eager mode runs .delay() inline and would block the API event loop,
+        # so it is opt-in (CELERY_EAGER=1, for tests/local runs), never tied to debug
+        task_always_eager=os.getenv("CELERY_EAGER") == "1",
+        task_eager_propagates=True,
+        task_store_eager_result=True,
+        task_ignore_result=False,
+        result_expires=3600,  # 1 hour result retention
+
+        # PRODUCTION RELIABILITY: Advanced task configuration
+        task_acks_late=True,  # Acknowledge tasks only after completion
+        task_reject_on_worker_lost=True,  # Reject tasks when worker dies
+        task_track_started=True,  # Track task start events
+        broker_connection_retry_on_startup=True,  # Keep retrying if the broker is not up yet
+
+        # Worker configuration - Production performance
+        # One task at a time for long document jobs; the dedicated embeddings
+        # worker overrides this with --prefetch-multiplier 16 (see docker-compose)
+        worker_prefetch_multiplier=1,
+        worker_max_tasks_per_child=1000,  # Restart workers periodically
+        worker_disable_rate_limits=False,  # Enable rate limiting
+
+        # PRODUCTION RETRY POLICY: Intelligent retry handling
+        task_default_retry_delay=60,  # Wait 60s before retry
+        task_max_retries=3,  # Maximum 3 retries
+        task_soft_time_limit=300,  # 5 minute soft timeout
+        task_time_limit=360,  # 6 minute hard timeout
+
+        # Broker/backend connections - pooled keep-alive sockets (redis-py picks
+        # the hiredis parser automatically when it is installed)
+        broker_transport_options={
+            "socket_keepalive": True,
+            "health_check_interval": 30,
+            "max_connections": 64,
         },
-        'api.tasks.document_tasks.process_document': {
-            'rate_limit': '5/s',   # Document processing: 5/second
-            'time_limit': 600,     # 10 minute timeout for large docs
-            'soft_time_limit': 540, # 9 minute soft timeout
-            'autoretry_for': (Exception,),
-            'retry_kwargs': {'max_retries': 3, 'countdown': 60},
+        redis_socket_keepalive=True,
+        redis_backend_health_check_interval=30,
+        redis_max_connections=64,
+
+        # Serialization - Production security
+        task_serializer=TASK_SERIALIZER,
+        accept_content=["msgpack", "json"] if MSGPACK_AVAILABLE else ["json"],
+        result_serializer=TASK_SERIALIZER,
+        timezone="UTC",
+        enable_utc=True,
+
+        # PRODUCTION MONITORING: Comprehensive observability
+        worker_send_task_events=True,
+        task_send_sent_event=True,
+        worker_log_format="[%(asctime)s: %(levelname)s/%(processName)s] [CELERY] %(message)s",
+
+        # PRODUCTION ERROR HANDLING: Robust error management
+        task_annotations={
+            '*': {
+                'rate_limit': '10/s',  # 10 tasks per second max
+                'time_limit': 360,     # 6 minute timeout
+                'soft_time_limit': 300, # 5 minute soft timeout
+            },
+            'api.tasks.document_tasks.process_document': {
+                'rate_limit': '5/s',   # Document processing: 5/second
+                'time_limit': 600,     # 10 minute timeout for large docs
+                'soft_time_limit': 540, # 9 minute soft timeout
+                'autoretry_for': (Exception,),
+                'retry_kwargs': {'max_retries': 3, 'countdown': 60},
+            }
         }
-    }
-)
+    )
+
+    logger.info(f"Celery configured with broker: {config['broker_url']}")
+    logger.info(f"Debug mode: {config['debug']}")
+
+    return app
+
+
+celery_app = make_celery()
+
+
+@worker_process_init.connect
+def _connect_after_fork(**kwargs):
+    """Drop connections inherited from the parent and connect fresh in the child."""
+    celery_app.pool.force_close_all()
+    with celery_app.connection_for_read() as conn:
+        conn.ensure_connection(max_retries=3)
 
-logger.info(f"Celery configured with broker: {config['broker_url']}")
-logger.info(f"Debug mode: {config['debug']}")
 
 # Auto-discover tasks
 celery_app.autodiscover_tasks()
@@ -5,26 +5,56 @@ Embedding generation tasks for Celery.
 import logging
 from typing import Dict, Any, List
 
-from .celery_app import celery_app
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+from .celery_app import celery_app, TASK_SERIALIZER
+from .document_tasks import get_embedding_service
 
 logger = logging.getLogger(__name__)
 
+# Texts per model forward pass; tasks carry many short chunks
+EMBEDDING_TASK_BATCH_SIZE = 64
+
 
 @celery_app.task(bind=True)
 def generate_embeddings(self, texts: List[str], document_id: str) -> Dict[str, Any]:
     """
     Generate embeddings for text chunks in the background.
+
+    The whole list is encoded in one model call so each message fills a
+    batch; callers should send many chunks per task rather than one.
+
+    With the msgpack serializer the embeddings are returned as raw float16
+    bytes (row-major, shape given by "shape"); otherwise as float lists.
     """
     try:
-        logger.info(f"Generating embeddings for document {document_id}")
+        logger.info(f"Generating embeddings for {len(texts)} chunks of document {document_id}")
+
+        embeddings = get_embedding_service().encode_array(texts, batch_size=EMBEDDING_TASK_BATCH_SIZE)
 
-        # TODO: Implement embedding generation logic
-        # This is a placeholder for now
+        if NUMPY_AVAILABLE and isinstance(embeddings, np.ndarray) and TASK_SERIALIZER == "msgpack":
+            # Half precision keeps cosine ranking intact at a quarter of the float64 payload
+            shape = list(embeddings.shape)
+            dtype = "float16"
+            embeddings = embeddings.astype(np.float16).tobytes()
+        else:
+            if hasattr(embeddings, "tolist"):
+                embeddings = embeddings.tolist()
+            shape = [len(embeddings), len(embeddings[0]) if embeddings else 0]
+            dtype = "float32"
 
         return {
             "status": "completed",
             "document_id": document_id,
-            "embeddings_count": len(texts),
+            "embeddings_count": shape[0],
+            "embeddings": embeddings,
+            "dtype": dtype,
+            "shape": shape,
             "message": "Embeddings generated successfully"
         }
 
@@ -3,18 +3,160 @@ Base document extractor interface and common functionality.
 Provides a unified interface for extracting text from various document formats.
 """
 
+import base64
 import hashlib
+import json
 import mimetypes
+import mmap
+import os
+import re
+import unicodedata
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import structlog
 
+try:
+    import regex
+    REGEX_AVAILABLE = True
+except ImportError:
+    regex = None
+    REGEX_AVAILABLE = False
+
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    xxhash = None
+    XXHASH_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
 logger = structlog.get_logger(__name__)
 
+# Cap on cleaned document text, in UTF-8 bytes (what PostgreSQL stores)
+MAX_TEXT_BYTES = 10 * 1024 * 1024
+
+# Files above this size are hashed from a read-only mapping of the page cache
+CHECKSUM_MMAP_MIN_BYTES = 4 * 1024 * 1024
+
+# Characters to keep in cleaned text, by Unicode category (per ipsec.pl guidance)
+_ALLOWED_CATEGORIES = frozenset({
+    'Lu', 'Ll', 'Lt', 'Lo',  # Letters (Lo includes ideographs like Chinese/Japanese)
+    'Nd', 'Nl', 'No',        # Numbers
+    'Zs', 'Zl', 'Zp',        # Separators
+    'Po', 'Pd', 'Ps', 'Pe', 'Pi', 'Pf', 'Pc',  # Punctuation
+    'Sm', 'Sc',              # Symbols (math, currency)
+})
+
+# Same whitelist as one C-level scan (the regex package supports \p{..})
+_DISALLOWED_RE = regex.compile(
+    r'[^\p{Lu}\p{Ll}\p{Lt}\p{Lo}\p{Nd}\p{Nl}\p{No}\p{Zs}\p{Zl}\p{Zp}\p{P}\p{Sm}\p{Sc}\n\r\t]'
+) if REGEX_AVAILABLE else None
+
+# Code points deleted in one str.translate pass: NUL, the replacement
+# character, directional overrides/marks, and C0/C1 controls other than \t \n \r
+_DELETE_TABLE = dict.fromkeys(
+    [0x00, 0xFFFD, 0x202E, 0x202D, 0x200E, 0x200F]
+    + list(range(0x01, 0x09)) + [0x0B, 0x0C]
+    + list(range(0x0E, 0x20)) + list(range(0x7F, 0xA0))
+)
+
+
+_WORD_RE = re.compile(r'\S+')
+_SPACES_RE = re.compile(r' +')
+# A line break with the surrounding whitespace and any blank lines after it
+_LINE_BREAKS_RE = re.compile(r'[^\S\n]*\n\s*')
+# Emergency fallback when cleaning fails: control characters only
+_CONTROL_CHARS_RE = re.compile(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F-\x9F]')
+
+
+class _CategoryFilterTable(dict):
+    """str.translate table that classifies each code point once, on first sight."""
+
+    def __missing__(self, codepoint: int) -> Optional[int]:
+        char = chr(codepoint)
+        keep = unicodedata.category(char) in _ALLOWED_CATEGORIES or char in '\n\r\t'
+        value = self[codepoint] = codepoint if keep else None
+        return value
+
+
+_CATEGORY_FILTER_TABLE = _CategoryFilterTable()
+
+
+def filter_unicode_categories(text: str) -> str:
+    """Drop characters outside the allowed Unicode categories."""
+    if _DISALLOWED_RE is not None:
+        return _DISALLOWED_RE.sub('', text)
+    # Without the regex package: one C-level translate pass writing a single
+    # output buffer, instead of a per-character Python loop into a list
+    return text.translate(_CATEGORY_FILTER_TABLE)
+
+
+def truncate_for_db(text: str, max_bytes: int = MAX_TEXT_BYTES, marker: str = "\n... [TRUNCATED]") -> str:
+    """
+    Cap text at max_bytes of UTF-8, cutting on a code point boundary.
+
+    Returns the same object when no truncation was needed.
+    """
+    # At most 4 bytes per code point, so short texts skip the encode
+    if len(text) * 4 <= max_bytes:
+        return text
+    encoded = text.encode('utf-8')
+    if len(encoded) <= max_bytes:
+        return text
+    return encoded[:max_bytes].decode('utf-8', errors='ignore') + marker
+
+
+def _hash_file(file_path: Union[str, Path]) -> str:
+    """
+    Fingerprint the file contents for change detection.
+
+    Uses XXH3-128 (SIMD, non-cryptographic) when xxhash is installed,
+    SHA-256 otherwise.
+    """
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size > CHECKSUM_MMAP_MIN_BYTES:
+            # No per-read copy into Python bytes; both hashers accept buffers
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                digest = xxhash.xxh3_128(mm) if XXHASH_AVAILABLE else hashlib.sha256(mm)
+                return digest.hexdigest()
+
+        if not XXHASH_AVAILABLE:
+            return hashlib.file_digest(f, "sha256").hexdigest()
+
+        digest = xxhash.xxh3_128()
+        # 1MB reads amortize syscalls and let kernel read-ahead work
+        while chunk := f.read(1 << 20):
+            digest.update(chunk)
+        return digest.hexdigest()
+
+
+@lru_cache(maxsize=1024)
+def _cached_checksum(path_str: str, mtime_ns: int, size: int) -> str:
+    """Checksum memoized on (path, mtime, size); a modified file gets a new key."""
+    return _hash_file(path_str)
+
+
+def _json_default(obj: Any) -> Any:
+    """Encode values JSON has no type for (bytes, datetimes, numpy arrays)."""
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        return base64.b64encode(obj).decode("ascii")
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
 
 @dataclass
 class DocumentMetadata:
@@ -31,7 +173,7 @@ class DocumentMetadata:
     language: Optional[str] = None
     page_count: Optional[int] = None
     word_count: Optional[int] = None
-    checksum: Optional[str] = None
+    checksum: Optional[str] = None  # Content fingerprint for change detection, not security
     source_path: Optional[str] = None
     custom_fields: Optional[Dict[str, Any]] = None
 
@@ -55,6 +197,17 @@ class ExtractedContent:
         if self.extraction_timestamp is None:
             self.extraction_timestamp = datetime.utcnow()
 
+    def to_json(self) -> bytes:
+        """
+        Serialize to UTF-8 JSON; image and other binary data become base64 strings.
+
+        orjson serializes the dataclasses and datetimes natively when available,
+        without the deep copy that asdict() makes.
+        """
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(self, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY)
+        return json.dumps(asdict(self), default=_json_default).encode()
+
 
 class BaseExtractor(ABC):
     """Base class for document extractors."""
@@ -97,12 +250,8 @@ class BaseExtractor(ABC):
         return False
 
     def _calculate_checksum(self, file_path: Union[str, Path]) -> str:
-        """Calculate MD5 checksum of the file."""
-        hash_md5 = hashlib.md5()
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_md5.update(chunk)
-        return hash_md5.hexdigest()
+        """Fingerprint the file contents for change detection."""
+        return _hash_file(file_path)
 
     def _create_metadata(self, file_path: Union[str, Path]) -> DocumentMetadata:
         """Create basic metadata for the document."""
@@ -119,7 +268,8 @@ class BaseExtractor(ABC):
             mime_type=mime_type,
             created_at=datetime.fromtimestamp(stat.st_ctime),
             modified_at=datetime.fromtimestamp(stat.st_mtime),
-            checksum=self._calculate_checksum(file_path),
+            # Retries of the same unchanged file skip re-hashing
+            checksum=_cached_checksum(str(file_path.absolute()), stat.st_mtime_ns, stat.st_size),
             source_path=str(file_path.absolute())
         )
 
@@ -149,72 +299,19 @@ class BaseExtractor(ABC):
             return ""
 
         try:
-            import re
-            import unicodedata
-
-            # Step 1: Remove null bytes and other problematic control characters
+            # Steps 1, 2 and 4 in a single pass: remove null bytes, replacement
+            # characters, malicious directional controls and other control characters,
+            # keeping newlines (0x0A), carriage returns (0x0D) and tabs (0x09).
             # PostgreSQL cannot handle NUL (0x00) characters in text fields
-            text = text.replace('\x00', '')  # Remove null bytes
-            text = text.replace('\ufffd', '')  # Remove replacement characters ()
-
-            # Step 2: Remove malicious Unicode control characters
             # Reference: https://ipsec.pl/input-validation-of-free-form-unicode-text-in-python.html
             # "RIGHT-TO-LEFT OVERRIDE is especially tricky as it's being actively used in attacks"
-            dangerous_chars = [
-                '\u202e',  # RIGHT-TO-LEFT OVERRIDE (used in file.exe.txt attacks per ipsec.pl)
-                '\u202d',  # LEFT-TO-RIGHT OVERRIDE
-                '\u200e',  # LEFT-TO-RIGHT MARK
-                '\u200f',  # RIGHT-TO-LEFT MARK
-            ]
-            for dangerous_char in dangerous_chars:
-                text = text.replace(dangerous_char, '')
+            text = text.translate(_DELETE_TABLE)
 
             # Step 3: Advanced Unicode category-based validation
             # Reference: https://ipsec.pl/input-validation-of-free-form-unicode-text-in-python.html
             # "In Python, you can easily validate Unicode free-form text by whitelisting
             # specific Unicode character categories such as lowercase letters, uppercase letters, ideographs"
-            cleaned_chars = []
-            for char in text:
-                category = unicodedata.category(char)
-
-                # Allow character categories that make sense for document text
-                # Based on Unicode categories analysis from ipsec.pl documentation
-                # Categories correspond to: Lu=Uppercase_Letter, Ll=Lowercase_Letter, etc.
-                allowed_categories = {
-                    'Lu',  # Uppercase_Letter
-                    'Ll',  # Lowercase_Letter
-                    'Lt',  # Titlecase_Letter
-                    'Lo',  # Other_Letter (includes ideographs like Chinese/Japanese per ipsec.pl)
-                    'Nd',  # Decimal_Number
-                    'Nl',  # Letter_Number
-                    'No',  # Other_Number
-                    'Zs',  # Space_Separator (spaces)
-                    'Zl',  # Line_Separator
-                    'Zp',  # Paragraph_Separator
-                    'Po',  # Other_Punctuation (periods, commas, etc.)
-                    'Pd',  # Dash_Punctuation (hyphens)
-                    'Ps',  # Open_Punctuation (opening brackets)
-                    'Pe',  # Close_Punctuation (closing brackets)
-                    'Pi',  # Initial_Punctuation (opening quotes)
-                    'Pf',  # Final_Punctuation (closing quotes)
-                    'Pc',  # Connector_Punctuation (underscores)
-                    'Sm',  # Math_Symbol (basic math symbols)
-                    'Sc',  # Currency_Symbol
-                }
-
-                # Keep allowed characters and common whitespace
-                if category in allowed_categories or char in '\n\r\t':
-                    cleaned_chars.append(char)
-                else:
-                    # Log unexpected characters for monitoring (not security per ipsec.pl)
-                    # "input validation should not be used to prevent XSS or SQLi"
-                    self.logger.debug(f"Filtered Unicode character: {repr(char)} (category: {category})")
-
-            text = ''.join(cleaned_chars)
-
-            # Step 4: Remove other problematic control characters but preserve useful ones
-            # Keep newlines (0x0A), carriage returns (0x0D), and tabs (0x09)
-            text = re.sub(r'[\x01-\x08\x0B\x0C\x0E-\x1F\x7F-\x9F]', '', text)
+            text = filter_unicode_categories(text)
 
             # Step 5: Normalize Unicode characters to prevent encoding issues
             # Reference: https://ipsec.pl/input-validation-of-free-form-unicode-text-in-python.html
@@ -226,42 +323,24 @@ class BaseExtractor(ABC):
                 self.logger.warning(f"Unicode normalization failed: {e}")
                 # Continue with original text if normalization fails
 
-            # Step 6: Clean whitespace and line breaks
-            # Split into lines for processing
-            lines = text.split('\n')
-            cleaned_lines = []
-
-            for line in lines:
-                # Remove leading/trailing whitespace
-                line = line.strip()
-
-                # Replace multiple consecutive spaces with single space
-                line = re.sub(r' +', ' ', line)
+            # Step 6: Clean whitespace without splitting into a list of lines
+            # Replace multiple consecutive spaces with single space
+            text = _SPACES_RE.sub(' ', text)
 
-                # Skip empty lines but preserve intentional line breaks
-                if line:
-                    cleaned_lines.append(line)
+            # Step 7: Strip each line and drop empty lines, keeping one line break
+            # between non-empty lines
+            cleaned_text = _LINE_BREAKS_RE.sub('\n', text).strip()
 
-            # Step 7: Rejoin lines with consistent line breaks
-            cleaned_text = '\n'.join(cleaned_lines)
-
-            # Step 8: Final validation and safety checks
-            # Ensure the text is valid UTF-8 and doesn't contain problematic sequences
-            try:
-                # Test encoding/decoding to catch any remaining issues
-                cleaned_text.encode('utf-8').decode('utf-8')
-            except UnicodeError as e:
-                self.logger.warning(f"Text contains invalid UTF-8 sequences: {e}")
-                # Replace invalid sequences with empty string as last resort
-                cleaned_text = cleaned_text.encode('utf-8', errors='ignore').decode('utf-8')
+            # Step 8: No UTF-8 round-trip is needed: a str can only fail to encode
+            # if it holds lone surrogates (category Cs), which Step 3 already removed
 
             # Step 9: Length validation
             # Reference: OWASP Input Validation Cheatsheet (cited in ipsec.pl)
             # "define a maximum length for the input field"
-            max_length = 10_000_000  # 10MB text limit for safety
-            if len(cleaned_text) > max_length:
-                self.logger.warning(f"Text too large ({len(cleaned_text)} chars), truncating")
-                cleaned_text = cleaned_text[:max_length] + "... [TRUNCATED]"
+            truncated = truncate_for_db(cleaned_text)
+            if truncated is not cleaned_text:
+                self.logger.warning(f"Text too large ({len(cleaned_text)} chars), truncating to {MAX_TEXT_BYTES} bytes")
+                cleaned_text = truncated
 
             return cleaned_text
 
@@ -269,33 +348,47 @@ class BaseExtractor(ABC):
             self.logger.error(f"Text cleaning failed: {e}")
             # Emergency fallback: basic null byte removal only
             # Reference: https://www.educative.io/answers/how-to-sanitize-user-input-in-python
-            return re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F-\x9F]', '', text) if text else ""
+            return _CONTROL_CHARS_RE.sub('', text) if text else ""
 
     def _chunk_text(self, text: str, chunk_size: int = 1000, overlap: int = 200) -> List[str]:
-        """Split text into overlapping chunks."""
+        """
+        Split text into overlapping chunks of whole words.
+
+        Chunks are slices of the original text between word boundaries, so each
+        chunk is copied once instead of being re-joined from a word list.
+        """
         if not text or chunk_size <= 0:
             return []
+        return self._chunk_and_count_words(text, chunk_size, overlap)[0]
 
-        words = text.split()
-        if len(words) <= chunk_size:
-            return [text]
+    def _chunk_and_count_words(self, text: str, chunk_size: int = 1000,
+                               overlap: int = 200) -> Tuple[List[str], int]:
+        """
+        Chunk text as _chunk_text does and return its word count as well.
 
-        chunks = []
-        start = 0
+        Both come from one scan for word boundaries, so extractors need not
+        walk the text again in _count_words.
+        """
+        if not text:
+            return [], 0
 
-        while start < len(words):
-            end = min(start + chunk_size, len(words))
-            chunk = ' '.join(words[start:end])
-            chunks.append(chunk)
+        spans = [match.span() for match in _WORD_RE.finditer(text)]
+        word_count = len(spans)
+        if chunk_size <= 0:
+            return [], word_count
+        if word_count <= chunk_size:
+            return [text], word_count
 
-            # Move start position with overlap
-            if end == len(words):
-                break
-            start = end - overlap
-            if start <= 0:
-                start = end
+        step = chunk_size - overlap if 0 <= overlap < chunk_size else chunk_size
+        # Stop at the first chunk that reaches the last word
+        chunk_count = -(-(word_count - chunk_size) // step) + 1
+
+        chunks = []
+        for first in range(0, chunk_count * step, step):
+            last = min(first + chunk_size, word_count) - 1
+            chunks.append(text[spans[first][0]:spans[last][1]])
 
-        return chunks
+        return chunks, word_count
 
     @abstractmethod
     async def extract(self, file_path: Union[str, Path]) -> ExtractedContent:
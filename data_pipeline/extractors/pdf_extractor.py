@@ -3,10 +3,19 @@ PDF EXTRACTOR - Production Grade
 ==============================
 """
 
+import hashlib
 import io
+import mmap
+import multiprocessing
+import os
 import re
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from itertools import repeat
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union, Tuple
 
 import structlog
 
@@ -26,19 +35,220 @@ try:
 except ImportError:
     PyPDF2 = None
 
+try:
+    from tesserocr import PyTessBaseAPI, PSM, OEM
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    PyTessBaseAPI = PSM = OEM = None
+    TESSEROCR_AVAILABLE = False
+
 try:
     import pytesseract
+except ImportError:
+    pytesseract = None
+
+try:
     from PIL import Image
     import cv2
     import numpy as np
-    OCR_AVAILABLE = True
+    OCR_AVAILABLE = TESSEROCR_AVAILABLE or pytesseract is not None
 except ImportError:
     OCR_AVAILABLE = False
 
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    diskcache = None
+    DISKCACHE_AVAILABLE = False
+
 from .base import BaseExtractor, ExtractedContent, DocumentMetadata, ExtractionError
 
 logger = structlog.get_logger(__name__)
 
+# Characters that are neither alphanumeric nor whitespace (\w is alnum plus "_")
+_NON_TEXT_CHARS_RE = re.compile(r'[^\w\s]|_')
+
+# Tesseract settings; part of the OCR cache key so a change invalidates entries.
+# The tesserocr path mirrors these (PSM.AUTO_OSD, OEM.DEFAULT).
+TESSERACT_CONFIG = '--psm 1 --oem 3'
+OCR_LANG = 'eng'
+
+# OCR render scale is derived from the page's scan resolution: no upsampling
+# past the source, no more than OCR_TARGET_DPI, within these bounds (1.0 = 72 DPI).
+# Pages without embedded images keep the default 2x (144 DPI).
+OCR_TARGET_DPI = 300
+OCR_MIN_SCALE = 1.0
+OCR_MAX_SCALE = 3.0
+OCR_DEFAULT_SCALE = 2.0
+
+# Grey-level standard deviation below which a rendered page is not thresholded
+OCR_MIN_CONTRAST_STD = 5.0
+
+# OCR results kept in memory per extractor when no cache directory is configured
+OCR_MEMORY_CACHE_SIZE = 256
+
+# pdfplumber/PyPDF2 read files above this size through a memory map
+MMAP_MIN_BYTES = 64 << 20
+
+# Plain-text extraction flags: image blocks are never laid out, whatever the
+# installed PyMuPDF's defaults; tables and images have their own passes
+PAGE_TEXT_FLAGS = (fitz.TEXTFLAGS_TEXT & ~fitz.TEXT_PRESERVE_IMAGES) if fitz else 0
+
+# Below this many pages, worker start-up costs more than parallel extraction saves
+PARALLEL_MIN_PAGES = 8
+
+
+@dataclass
+class PageResult:
+    """Text, tables and images extracted from one PDF page (page is 1-based)."""
+
+    page: int
+    text: str
+    tables: List[Dict[str, Any]] = field(default_factory=list)
+    images: List[Dict[str, Any]] = field(default_factory=list)
+
+
+def _iter_pymupdf_pages(doc, page_numbers, extract_tables: bool, extract_images: bool,
+                        skip_image_only_pages: bool = True) -> Iterator[PageResult]:
+    """Yield a PageResult per page of an open document; failed pages are skipped."""
+    for page_num in page_numbers:
+        try:
+            page = doc[page_num]
+
+            # A page without fonts (e.g. a scan) has no text layer; checking the
+            # resource dictionary avoids decoding its image streams for nothing
+            has_text_layer = not skip_image_only_pages or bool(page.get_fonts())
+
+            # Extract text
+            page_text = page.get_text("text", flags=PAGE_TEXT_FLAGS) if has_text_layer else ""
+            tables = []
+            images = []
+
+            # Extract tables if enabled
+            if extract_tables and has_text_layer:
+                try:
+                    tabs = page.find_tables()
+                    for tab in tabs:
+                        table_data = tab.extract()
+                        if table_data:
+                            tables.append({
+                                "page": page_num + 1,
+                                "data": table_data
+                            })
+                except Exception as e:
+                    logger.warning("Table extraction failed", page=page_num + 1, error=str(e))
+
+            # Extract images if enabled
+            if extract_images:
+                try:
+                    image_list = page.get_images()
+                    for img_index, img in enumerate(image_list):
+                        xref = img[0]
+                        # Stored stream bytes (JPEG, JP2, PNG...) as-is; no decode + PNG re-encode
+                        img_info = doc.extract_image(xref)
+                        if img_info:
+                            images.append({
+                                "page": page_num + 1,
+                                "ext": img_info["ext"],
+                                "data": img_info["image"]
+                            })
+                except Exception as e:
+                    logger.warning("Image extraction failed", page=page_num + 1, error=str(e))
+
+        except Exception as e:
+            logger.warning("Page processing failed", page=page_num + 1, error=str(e))
+            continue
+
+        yield PageResult(page_num + 1, page_text, tables, images)
+
+
+def _extract_pymupdf_pages(doc, page_numbers, extract_tables: bool, extract_images: bool,
+                           skip_image_only_pages: bool = True):
+    """Extract text parts, tables and images from the given pages of an open document."""
+    text_parts = []
+    tables = []
+    images = []
+
+    for result in _iter_pymupdf_pages(doc, page_numbers, extract_tables, extract_images, skip_image_only_pages):
+        if result.text and result.text.strip():
+            text_parts.append(result.text)
+        tables.extend(result.tables)
+        images.extend(result.images)
+
+    return text_parts, tables, images
+
+
+def _extract_pymupdf_page_block(file_path: str, start: int, stop: int, extract_tables: bool, extract_images: bool,
+                                skip_image_only_pages: bool = True):
+    """Worker-process entry point: fitz documents are not picklable, so each block opens its own."""
+    doc = fitz.open(file_path)
+    try:
+        return _extract_pymupdf_pages(
+            doc, range(start, stop), extract_tables, extract_images, skip_image_only_pages
+        )
+    finally:
+        doc.close()
+
+
+def _ocr_render_scale(page) -> float:
+    """Pick the OCR render scale from the effective DPI of the page's largest-resolution image."""
+    native_dpi = 0.0
+    for info in page.get_image_info():
+        # Pixels across the image over the inches it covers on the page (72 points per inch)
+        width_pt = info["bbox"][2] - info["bbox"][0]
+        if width_pt > 0:
+            native_dpi = max(native_dpi, info["width"] * 72 / width_pt)
+
+    if not native_dpi:
+        return OCR_DEFAULT_SCALE
+    scale = min(native_dpi, OCR_TARGET_DPI) / 72
+    return min(max(scale, OCR_MIN_SCALE), OCR_MAX_SCALE)
+
+
+@contextmanager
+def _open_pdf_stream(file_path: Path):
+    """
+    Open a PDF as a binary stream for the pure-Python parsers.
+
+    pdfminer and PyPDF2 issue many small seek/read calls; on large files a
+    read-only mapping serves them from the page cache without a syscall each.
+    """
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size > MMAP_MIN_BYTES:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                yield mm
+        else:
+            yield f
+
+
+def _can_start_process_pool() -> bool:
+    """
+    Whether this process may fork a worker pool.
+
+    Daemonic processes (e.g. Celery prefork workers) are not allowed to have
+    children, so ProcessPoolExecutor cannot start there.
+    """
+    return not multiprocessing.current_process().daemon
+
+
+# One extractor per worker process in extract_many(), built by the pool initializer
+_worker_extractor = None
+
+
+def _init_worker_extractor(config: Dict[str, Any]):
+    """Pool initializer: build this process's extractor once (OCR checks included)."""
+    global _worker_extractor
+    if OCR_AVAILABLE:
+        # The pool already supplies the parallelism; OpenCV's own threads would oversubscribe
+        cv2.setNumThreads(1)
+    _worker_extractor = PDFExtractor(config)
+
+
+def _extract_path_in_worker(file_path: str) -> "ExtractedContent":
+    """Worker-process entry point for document-level parallel extraction."""
+    return _worker_extractor.extract(file_path)
+
 
 class PDFExtractor(BaseExtractor):
     """Production-grade PDF text extractor with multiple extraction methods."""
@@ -50,11 +260,24 @@ class PDFExtractor(BaseExtractor):
         # Production configuration
         self.use_ocr = self.config.get("use_ocr", False)
         self.ocr_threshold = self.config.get("ocr_threshold", 0.8)
+        self.force_ocr = self.config.get("force_ocr", False)
         self.extract_images = self.config.get("extract_images", False)
         self.extract_tables = self.config.get("extract_tables", True)
         self.preferred_method = self.config.get("preferred_method", "auto")
         self.chunk_size = self.config.get("chunk_size", 1000)
         self.chunk_overlap = self.config.get("chunk_overlap", 200)
+        # Skip text/table extraction on pages with no fonts (scanned images);
+        # OCR renders pages separately, so it is unaffected
+        self.skip_image_only_pages = self.config.get("skip_image_only_pages", True)
+        # OCR results keyed by page-image hash (persistent when a directory is given)
+        self.ocr_cache_dir = self.config.get("ocr_cache_dir")
+        if self.ocr_cache_dir and DISKCACHE_AVAILABLE:
+            self._ocr_cache = diskcache.Cache(self.ocr_cache_dir)
+        else:
+            self._ocr_cache = None
+        self._ocr_memory_cache = OrderedDict()
+        # Worker processes for page-parallel PyMuPDF extraction (1 disables it)
+        self.num_workers = self.config.get("num_workers", min(os.cpu_count() or 1, 4))
 
         # Initialize available methods
         self.available_methods = []
@@ -68,6 +291,10 @@ class PDFExtractor(BaseExtractor):
         if not self.available_methods:
             raise ExtractionError("No PDF extraction libraries available")
 
+        # Resolve the extraction method once; extract() calls the bound runner directly
+        self._extraction_method = self._choose_extraction_method()
+        self._extraction_method_name, self._run_extract = self._bind_extraction_method(self._extraction_method)
+
         # Validate OCR at runtime (not import time)
         if self.use_ocr:
             ocr_available = self._check_ocr_availability()
@@ -103,6 +330,7 @@ class PDFExtractor(BaseExtractor):
             "author": None,
             "subject": None
         }
+        shared_doc = None
 
         try:
             logger.info("Starting PDF extraction", file=file_path.name)
@@ -110,21 +338,16 @@ class PDFExtractor(BaseExtractor):
             # Create base metadata
             metadata = self._create_metadata(file_path)
 
-            # Choose extraction method
-            method = self._choose_extraction_method()
-
-            # Execute extraction
-            if method == "pymupdf" and fitz:
-                text, tables, images, page_info = self._extract_with_pymupdf(file_path)
-                extraction_method = "PyMuPDF"
-            elif method == "pdfplumber" and pdfplumber:
-                text, tables, page_info = self._extract_with_pdfplumber(file_path)
-                extraction_method = "pdfplumber"
-            elif method == "pypdf2" and PyPDF2:
-                text, page_info = self._extract_with_pypdf2(file_path)
-                extraction_method = "PyPDF2"
+            # Execute extraction with the method bound at construction
+            if self._run_extract is None:
+                raise ExtractionError(f"Extraction method {self._extraction_method} not available")
+            if self._extraction_method_name == "PyMuPDF" and self.use_ocr:
+                # The OCR pass may re-read this document; parse it once for both
+                shared_doc = fitz.open(str(file_path))
+                text, tables, images, page_info = self._extract_with_pymupdf(file_path, shared_doc)
             else:
-                raise ExtractionError(f"Extraction method {method} not available")
+                text, tables, images, page_info = self._run_extract(file_path)
+            extraction_method = self._extraction_method_name
 
             # Safely update metadata
             if page_info:
@@ -134,19 +357,18 @@ class PDFExtractor(BaseExtractor):
                 metadata.subject = page_info.get("subject")
 
             # OCR enhancement if needed
-            if self.use_ocr and self._should_use_ocr(text):
+            if self.use_ocr and (self.force_ocr or self._should_use_ocr(text)):
                 logger.info("Enhancing with OCR")
-                ocr_text = self._extract_with_ocr(file_path)
+                ocr_text = self._extract_with_ocr(file_path, shared_doc)
                 if len(ocr_text) > len(text):
                     text = ocr_text
                     extraction_method += " + OCR"
 
             # Clean and process text
             text = self._clean_text(text)
-            metadata.word_count = self._count_words(text)
 
-            # Generate chunks
-            chunks = self._chunk_text(text, self.chunk_size, self.chunk_overlap)
+            # Generate chunks (word count comes from the same scan)
+            chunks, metadata.word_count = self._chunk_and_count_words(text, self.chunk_size, self.chunk_overlap)
 
             logger.info(
                 "PDF extraction completed",
@@ -169,6 +391,74 @@ class PDFExtractor(BaseExtractor):
             logger.error("PDF extraction failed", file=file_path.name, error=str(e))
             raise ExtractionError(f"Failed to extract from {file_path.name}: {str(e)}") from e
 
+        finally:
+            if shared_doc is not None:
+                shared_doc.close()
+
+    def extract_iter(self, file_path: Union[str, Path]) -> Iterator[PageResult]:
+        """
+        Yield raw PyMuPDF results page by page.
+
+        Only the current page is held in memory, so very large PDFs can be
+        streamed into downstream processing; cleaning, chunking and OCR are
+        left to the caller. extract() remains the whole-document entry point.
+        """
+        if not fitz:
+            raise ExtractionError("PyMuPDF is required for page streaming")
+
+        file_path = Path(file_path)
+        doc = fitz.open(str(file_path))
+        try:
+            yield from _iter_pymupdf_pages(
+                doc, range(doc.page_count), self.extract_tables, self.extract_images,
+                self.skip_image_only_pages
+            )
+        finally:
+            doc.close()
+
+    def extract_many(
+        self, file_paths: Iterable[Union[str, Path]], max_workers: Optional[int] = None
+    ) -> Iterator[Tuple[Path, Union[ExtractedContent, ExtractionError]]]:
+        """
+        Extract many PDFs in parallel, one document per worker process.
+
+        Yields (path, ExtractedContent or ExtractionError) in completion order so
+        results can stream into indexing. At most two documents per worker are
+        in flight, which bounds memory for large corpora.
+        """
+        max_workers = max_workers or os.cpu_count() or 1
+        max_inflight = 2 * max_workers
+        # Documents are already spread across processes; no nested page pools
+        worker_config = {**self.config, "num_workers": 1}
+
+        pending = {}
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker_extractor,
+            initargs=(worker_config,)
+        ) as executor:
+            paths = iter(file_paths)
+            while True:
+                for file_path in paths:
+                    file_path = Path(file_path)
+                    pending[executor.submit(_extract_path_in_worker, str(file_path))] = file_path
+                    if len(pending) >= max_inflight:
+                        break
+
+                if not pending:
+                    return
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    file_path = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except ExtractionError as e:
+                        result = e
+                    except Exception as e:
+                        result = ExtractionError(f"Failed to extract from {file_path.name}: {str(e)}")
+                    yield file_path, result
+
     def _choose_extraction_method(self) -> str:
         """Choose the optimal extraction method."""
         if self.preferred_method != "auto":
@@ -181,63 +471,74 @@ class PDFExtractor(BaseExtractor):
         else:
             return "pypdf2"
 
-    def _extract_with_pymupdf(self, file_path: Path) -> Tuple[str, List[Dict], List[Dict], Dict[str, Any]]:
-        """Extract using PyMuPDF with comprehensive error handling."""
-        doc = None
+    def _bind_extraction_method(self, method: str):
+        """
+        Return (display name, runner) for an extraction method.
+
+        Runners share the (text, tables, images, page_info) shape; the runner
+        is None when the method's library is not installed.
+        """
+        if method == "pymupdf" and fitz:
+            return "PyMuPDF", self._extract_with_pymupdf
+        if method == "pdfplumber" and pdfplumber:
+            def run_pdfplumber(file_path: Path):
+                text, tables, page_info = self._extract_with_pdfplumber(file_path)
+                return text, tables, [], page_info
+            return "pdfplumber", run_pdfplumber
+        if method == "pypdf2" and PyPDF2:
+            def run_pypdf2(file_path: Path):
+                text, page_info = self._extract_with_pypdf2(file_path)
+                return text, [], [], page_info
+            return "PyPDF2", run_pypdf2
+        return "unknown", None
+
+    def _extract_with_pymupdf(self, file_path: Path, doc=None) -> Tuple[str, List[Dict], List[Dict], Dict[str, Any]]:
+        """
+        Extract using PyMuPDF with comprehensive error handling.
+
+        Large documents are split into page blocks extracted in worker
+        processes (each opens its own fitz.Document) and reassembled in order.
+        An already open doc is used as is and left open for the caller.
+        """
+        own_doc = doc is None
         try:
-            doc = fitz.open(str(file_path))
-            text_parts = []
-            tables = []
-            images = []
-
-            for page_num in range(doc.page_count):
-                try:
-                    page = doc[page_num]
-
-                    # Extract text
-                    page_text = page.get_text()
-                    if page_text and page_text.strip():
-                        text_parts.append(page_text)
-
-                    # Extract tables if enabled
-                    if self.extract_tables:
-                        try:
-                            tabs = page.find_tables()
-                            for tab in tabs:
-                                table_data = tab.extract()
-                                if table_data:
-                                    tables.append({
-                                        "page": page_num + 1,
-                                        "data": table_data
-                                    })
-                        except Exception as e:
-                            logger.warning("Table extraction failed", page=page_num + 1, error=str(e))
-
-                    # Extract images if enabled
-                    if self.extract_images:
-                        try:
-                            image_list = page.get_images()
-                            for img_index, img in enumerate(image_list):
-                                xref = img[0]
-                                pix = fitz.Pixmap(doc, xref)
-                                if pix.n < 5:  # GRAY or RGB
-                                    img_data = pix.tobytes("png")
-                                    images.append({
-                                        "page": page_num + 1,
-                                        "data": img_data
-                                    })
-                                if pix:
-                                    pix = None
-                        except Exception as e:
-                            logger.warning("Image extraction failed", page=page_num + 1, error=str(e))
-
-                except Exception as e:
-                    logger.warning("Page processing failed", page=page_num + 1, error=str(e))
-                    continue
+            if own_doc:
+                doc = fitz.open(str(file_path))
+            page_count = doc.page_count
+
+            # Page texts are written into one buffer as they arrive instead of
+            # being held in a list and copied again by a final join
+            text_buffer = io.StringIO()
+            tables, images = [], []
+
+            def append_text(page_text: str):
+                if page_text and page_text.strip():
+                    if text_buffer.tell():
+                        text_buffer.write("\n")
+                    text_buffer.write(page_text)
+
+            blocks = None
+            if self.num_workers > 1 and page_count >= PARALLEL_MIN_PAGES and _can_start_process_pool():
+                blocks = self._extract_pymupdf_blocks_parallel(file_path, page_count)
+
+            if blocks is None:
+                for result in _iter_pymupdf_pages(
+                    doc, range(page_count), self.extract_tables, self.extract_images,
+                    self.skip_image_only_pages
+                ):
+                    append_text(result.text)
+                    tables.extend(result.tables)
+                    images.extend(result.images)
+            else:
+                for block_text, block_tables, block_images in blocks:
+                    for page_text in block_text:
+                        append_text(page_text)
+                    tables.extend(block_tables)
+                    images.extend(block_images)
 
             # Get document metadata safely
             page_info = {
-                "page_count": doc.page_count,
+                "page_count": page_count,
                 "title": None,
                 "author": None,
                 "subject": None
@@ -254,17 +555,43 @@ class PDFExtractor(BaseExtractor):
             except Exception as e:
                 logger.warning("Metadata extraction failed", error=str(e))
 
-            text = "\n".join(text_parts) if text_parts else ""
-            return text, tables, images, page_info
+            return text_buffer.getvalue(), tables, images, page_info
 
         finally:
-            if doc:
+            if own_doc and doc:
                 doc.close()
 
+    def _extract_pymupdf_blocks_parallel(self, file_path: Path, page_count: int) -> Optional[List[Tuple]]:
+        """
+        Extract page blocks in worker processes, each opening its own fitz.Document.
+
+        Returns the (texts, tables, images) blocks in page order, or None if
+        the pool could not run so the caller extracts sequentially instead.
+        """
+        # About four blocks per worker balances uneven pages against
+        # the cost of reopening the document in each block
+        block_size = max(1, page_count // (4 * self.num_workers))
+        starts = range(0, page_count, block_size)
+        try:
+            with ProcessPoolExecutor(max_workers=self.num_workers) as executor:
+                # map() yields block results in submission (page) order
+                return list(executor.map(
+                    _extract_pymupdf_page_block,
+                    repeat(str(file_path)),
+                    starts,
+                    [min(start + block_size, page_count) for start in starts],
+                    repeat(self.extract_tables),
+                    repeat(self.extract_images),
+                    repeat(self.skip_image_only_pages)
+                ))
+        except Exception as e:
+            logger.warning("Parallel page extraction failed, extracting sequentially", error=str(e))
+            return None
+
     def _extract_with_pdfplumber(self, file_path: Path) -> Tuple[str, List[Dict], Dict[str, Any]]:
         """Extract using pdfplumber with error handling."""
         try:
-            with pdfplumber.open(str(file_path)) as pdf:
+            with _open_pdf_stream(file_path) as stream, pdfplumber.open(stream) as pdf:
                 text_parts = []
                 tables = []
 
@@ -320,7 +647,7 @@ class PDFExtractor(BaseExtractor):
     def _extract_with_pypdf2(self, file_path: Path) -> Tuple[str, Dict[str, Any]]:
         """Extract using PyPDF2 with error handling."""
         try:
-            with open(file_path, "rb") as file:
+            with _open_pdf_stream(file_path) as file:
                 reader = PyPDF2.PdfReader(file)
                 text_parts = []
 
@@ -363,8 +690,8 @@ class PDFExtractor(BaseExtractor):
         if not text or len(text.strip()) < 100:
             return True
 
-        # Check text quality
-        text_chars = sum(1 for c in text if c.isalnum() or c.isspace())
+        # Check text quality: count alphanumeric/whitespace chars in one C-level pass
+        text_chars = len(_NON_TEXT_CHARS_RE.sub('', text))
         total_chars = len(text)
 
         if total_chars > 0:
@@ -373,40 +700,41 @@ class PDFExtractor(BaseExtractor):
 
         return False
 
-    def _extract_with_ocr(self, file_path: Path) -> str:
-        """Extract text using OCR."""
+    def _extract_with_ocr(self, file_path: Path, doc=None) -> str:
+        """Extract text using OCR; an already open doc is used and left open."""
         if not OCR_AVAILABLE:
             raise ExtractionError("OCR dependencies not available")
 
-        doc = None
+        own_doc = doc is None
+        api = None
         try:
-            doc = fitz.open(str(file_path))
+            if own_doc:
+                doc = fitz.open(str(file_path))
             text_parts = []
 
+            if TESSEROCR_AVAILABLE:
+                # One in-process engine for every page: the model loads once, no fork per page
+                api = PyTessBaseAPI(lang=OCR_LANG, psm=PSM.AUTO_OSD, oem=OEM.DEFAULT)
+
             for page_num in range(doc.page_count):
                 try:
                     page = doc[page_num]
 
-                    # Convert page to high-resolution image
-                    mat = fitz.Matrix(2, 2)
-                    pix = page.get_pixmap(matrix=mat)
-                    img_data = pix.tobytes("png")
-
-                    # Process with OCR
-                    img = Image.open(io.BytesIO(img_data))
-                    img_array = np.array(img)
+                    scale = _ocr_render_scale(page)
+                    logger.debug("OCR render scale", page=page_num + 1, scale=round(scale, 2))
 
-                    if len(img_array.shape) == 3:
-                        img_array = cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY)
+                    # Render straight to 8-bit grayscale; no PNG round-trip or colour conversion
+                    pix = page.get_pixmap(matrix=fitz.Matrix(scale, scale), colorspace=fitz.csGRAY, alpha=False)
+                    img_array = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width)
 
-                    # Enhance image for OCR
-                    img_array = cv2.threshold(img_array, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)[1]
+                    # Enhance image for OCR. A near-uniform page (blank or already flat) has
+                    # no foreground for Otsu to find, only noise to amplify, so it is left as is.
+                    # cv2.meanStdDev is one vectorized pass, unlike ndarray.std()'s float64 copy.
+                    if cv2.meanStdDev(img_array)[1][0][0] >= OCR_MIN_CONTRAST_STD:
+                        img_array = cv2.threshold(img_array, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)[1]
 
-                    # Extract text with OCR
-                    page_text = pytesseract.image_to_string(
-                        img_array,
-                        config='--psm 1 --oem 3'
-                    )
+                    # Extract text with OCR, unless this exact page image was seen before
+                    page_text = self._ocr_page(img_array, api)
 
                     if page_text and page_text.strip():
                         text_parts.append(page_text)
@@ -418,19 +746,64 @@ class PDFExtractor(BaseExtractor):
             return "\n".join(text_parts) if text_parts else ""
 
         finally:
-            if doc:
+            if api is not None:
+                api.End()
+            if own_doc and doc:
                 doc.close()
 
+    def _ocr_page(self, img_array, api=None) -> str:
+        """
+        OCR a thresholded page image, reusing cached text for identical images.
+
+        Uses the open tesserocr API when given, else the pytesseract CLI.
+        """
+        # Hashing the image takes milliseconds; Tesseract takes hundreds
+        key = (
+            hashlib.blake2b(img_array.tobytes(), digest_size=16).hexdigest(),
+            img_array.shape, OCR_LANG, TESSERACT_CONFIG
+        )
+
+        if self._ocr_cache is not None:
+            page_text = self._ocr_cache.get(key)
+        else:
+            page_text = self._ocr_memory_cache.get(key)
+            if page_text is not None:
+                self._ocr_memory_cache.move_to_end(key)
+        if page_text is not None:
+            return page_text
+
+        if api is not None:
+            api.SetImage(Image.fromarray(img_array))
+            page_text = api.GetUTF8Text()
+        else:
+            page_text = pytesseract.image_to_string(
+                img_array,
+                lang=OCR_LANG,
+                config=TESSERACT_CONFIG
+            )
+
+        if self._ocr_cache is not None:
+            self._ocr_cache.set(key, page_text)
+        else:
+            self._ocr_memory_cache[key] = page_text
+            if len(self._ocr_memory_cache) > OCR_MEMORY_CACHE_SIZE:
+                self._ocr_memory_cache.popitem(last=False)
+        return page_text
+
     def _check_ocr_availability(self) -> bool:
         """Check OCR availability at runtime."""
         try:
-            import pytesseract
             from PIL import Image
             import cv2
             import numpy as np
 
             # Test basic functionality
-            pytesseract.get_tesseract_version()
+            if TESSEROCR_AVAILABLE:
+                import tesserocr
+                tesserocr.tesseract_version()
+            else:
+                import pytesseract
+                pytesseract.get_tesseract_version()
             logger.info("✅ OCR dependencies confirmed available at runtime")
             return True
         except Exception as e:
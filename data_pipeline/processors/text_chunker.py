@@ -9,13 +9,51 @@ Enterprise-grade text chunking with:
 - Multiple chunking strategies
 """
 
+import mmap
+import multiprocessing
+import os
 import re
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
 
+# Regex patterns, compiled once per process and shared by every TextChunker.
+# Sentence boundaries (improved for academic/technical text). Numbered
+# lists, "etc.", "vs.", "e.g." and "i.e." all end in a period, so the
+# first alternative already covers them; fewer alternatives means fewer
+# lookbehind attempts at every position.
+_SENTENCE_RE = re.compile(
+    r'(?<=[.!?])\s+(?=[A-Z])|'  # Sentence endings before a capital
+    r'(?<=\.)\s+(?=\d)'          # After periods before numbers
+)
+
+# Paragraph boundaries
+_PARAGRAPH_RE = re.compile(r'\n\s*\n')
+
+# Section boundaries (headers, titles)
+_SECTION_RE = re.compile(
+    r'\n\s*(?:[A-Z][A-Z\s]{2,}|'  # ALL CAPS headers
+    r'\d+\.\s*[A-Z][a-z]+|'        # Numbered sections
+    r'#{1,6}\s+.+|'                # Markdown headers
+    r'[A-Z][a-z]+:(?:\s|$))'       # Title: format
+)
+
+# Remove excessive whitespace
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Chunks must carry at least one letter or digit
+_ALNUM_RE = re.compile(r'[a-zA-Z0-9]')
+
+# chunk_file() maps files at least this large and chunks their bytes in
+# place; smaller files are decoded whole and go through chunk_text()
+MMAP_MIN_BYTES = 64 << 20
+
+# ASCII whitespace bytes; never part of a multi-byte UTF-8 sequence
+_WHITESPACE_BYTES = (b' ', b'\n', b'\t', b'\r')
+
 
 @dataclass
 class ChunkingConfig:
@@ -28,6 +66,22 @@ class ChunkingConfig:
     language: str = "en"
 
 
+# One chunker per worker process in chunk_documents(), built by the pool initializer
+_worker_chunker = None
+
+
+def _init_worker_chunker(config: "ChunkingConfig"):
+    """Pool initializer: build this process's chunker once from the caller's config."""
+    global _worker_chunker
+    _worker_chunker = TextChunker(config.chunk_size, config.overlap_size, config.min_chunk_size)
+    _worker_chunker.config = config
+
+
+def _chunk_text_in_worker(text: str) -> List[str]:
+    """Worker-process entry point for document-level parallel chunking."""
+    return _worker_chunker.chunk_text(text)
+
+
 class TextChunker:
     """
     TEXT CHUNKER
@@ -52,37 +106,18 @@ class TextChunker:
             min_chunk_size=min_chunk_size
         )
 
-        # Compile regex patterns for efficient processing
+        # Attach the shared compiled regex patterns
         self._compile_patterns()
 
         logger.info(f"TextChunker initialized: {chunk_size}ch chunks, {overlap_size}ch overlap")
 
     def _compile_patterns(self):
-        """Compile regex patterns for text processing."""
-        # Sentence boundaries (improved for academic/technical text)
-        self.sentence_pattern = re.compile(
-            r'(?<=[.!?])\s+(?=[A-Z])|'  # Standard sentence endings
-            r'(?<=\.)\s+(?=\d)|'         # After periods before numbers
-            r'(?<=\d\.)\s+(?=[A-Z])|'    # After numbered lists
-            r'(?<=etc\.)\s+(?=[A-Z])|'   # After etc.
-            r'(?<=vs\.)\s+(?=[A-Z])|'    # After vs.
-            r'(?<=e\.g\.)\s+(?=[A-Z])|'  # After e.g.
-            r'(?<=i\.e\.)\s+(?=[A-Z])'   # After i.e.
-        )
-
-        # Paragraph boundaries
-        self.paragraph_pattern = re.compile(r'\n\s*\n')
-
-        # Section boundaries (headers, titles)
-        self.section_pattern = re.compile(
-            r'\n\s*(?:[A-Z][A-Z\s]{2,}|'  # ALL CAPS headers
-            r'\d+\.\s*[A-Z][a-z]+|'        # Numbered sections
-            r'#{1,6}\s+.+|'                # Markdown headers
-            r'[A-Z][a-z]+:(?:\s|$))'       # Title: format
-        )
-
-        # Remove excessive whitespace
-        self.whitespace_pattern = re.compile(r'\s+')
+        """Bind the module-level compiled patterns (shared by every instance)."""
+        self.sentence_pattern = _SENTENCE_RE
+        self.paragraph_pattern = _PARAGRAPH_RE
+        self.section_pattern = _SECTION_RE
+        self.whitespace_pattern = _WHITESPACE_RE
+        self.alnum_pattern = _ALNUM_RE
 
     def chunk_text(self, text: str) -> List[str]:
         """
@@ -116,18 +151,111 @@ class TextChunker:
             # Fallback to simple chunking
             return self._simple_chunk(text)
 
-    def _preprocess_text(self, text: str) -> str:
-        """Clean and normalize text for chunking."""
-        # Remove excessive whitespace while preserving structure
-        text = self.whitespace_pattern.sub(' ', text)
+    def chunk_documents(self, texts: List[str], max_workers: Optional[int] = None) -> List[List[str]]:
+        """
+        Chunk many documents in parallel, one document per worker process.
+
+        Chunking is CPU-bound regex and string work that the GIL serializes,
+        so independent documents are spread across processes. Results come
+        back in input order. A single document, a daemonic caller or a pool
+        that fails to start is chunked in-process.
+
+        Args:
+            texts: Document texts to chunk
+            max_workers: Worker processes (defaults to the CPU count)
 
-        # Remove leading/trailing whitespace
-        text = text.strip()
+        Returns:
+            One list of chunks per input text
+        """
+        max_workers = min(max_workers or os.cpu_count() or 1, len(texts))
+        # Daemonic processes (e.g. Celery prefork workers) cannot have children
+        if max_workers <= 1 or multiprocessing.current_process().daemon:
+            return [self.chunk_text(text) for text in texts]
+
+        try:
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_worker_chunker,
+                initargs=(self.config,)
+            ) as executor:
+                return list(executor.map(_chunk_text_in_worker, texts, chunksize=4))
+        except Exception as e:
+            logger.warning(f"Parallel chunking failed, chunking sequentially: {e}")
+            return [self.chunk_text(text) for text in texts]
+
+    def chunk_file(self, path: str) -> List[str]:
+        """
+        Chunk a UTF-8 text file.
 
-        # Preserve paragraph breaks
-        text = re.sub(r'\n\s*\n', '\n\n', text)
+        Files of MMAP_MIN_BYTES or more are memory-mapped and split on byte
+        offsets, decoding only the slices that become chunks, so the whole
+        document never exists as a Python str. That path uses character-based
+        chunking with sizes measured in bytes; smaller files get chunk_text().
 
-        return text
+        Args:
+            path: Path to the text file
+
+        Returns:
+            List of text chunks
+        """
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < MMAP_MIN_BYTES:
+                return self.chunk_text(f.read().decode('utf-8', 'replace'))
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                chunks = [
+                    ' '.join(mm[start:end].decode('utf-8', 'replace').split())
+                    for start, end in self._byte_chunk_spans(mm)
+                ]
+
+        chunks = self._validate_chunks(chunks)
+        logger.info(f"Generated {len(chunks)} chunks from {size} bytes")
+        return chunks
+
+    def _byte_chunk_spans(self, buf) -> List[tuple]:
+        """
+        (start, end) byte spans mirroring _chunk_by_characters over a UTF-8 buffer.
+
+        Cuts fall on ASCII whitespace where possible and otherwise on a
+        character start, so every span decodes cleanly.
+        """
+        spans = []
+        length = len(buf)
+        start = 0
+
+        while start < length:
+            end = start + self.config.chunk_size
+
+            if end >= length:
+                spans.append((start, length))
+                break
+
+            # Last whitespace byte in (start, end]
+            boundary = max(buf.rfind(ws, start + 1, end + 1) for ws in _WHITESPACE_BYTES)
+            if boundary != -1:
+                end = boundary
+            else:
+                # No word boundary: back off to the start of a UTF-8 character
+                while end > start + 1 and buf[end] & 0xC0 == 0x80:
+                    end -= 1
+
+            spans.append((start, end))
+
+            # Move start with overlap, onto a character start
+            start = max(start + 1, end - self.config.overlap_size)
+            while start < end and buf[start] & 0xC0 == 0x80:
+                start += 1
+
+        return spans
+
+    def _preprocess_text(self, text: str) -> str:
+        """Clean and normalize text for chunking."""
+        # Collapse every whitespace run (newlines included) to one space and trim.
+        # str.split() uses the same whitespace set as the regex \s, so this equals
+        # whitespace_pattern.sub(' ', text).strip() at about 3x the speed.
+        # No newline survives, so a paragraph-break pass afterwards would be a no-op.
+        return ' '.join(text.split())
 
     def _hierarchical_chunk(self, text: str) -> List[str]:
         """
@@ -139,14 +267,20 @@ class TextChunker:
         4. Fall back to character-based
         """
 
-        # Strategy 1: Section-based chunking
-        if self.config.preserve_paragraphs:
+        # Section and paragraph boundaries are anchored on newlines, which
+        # _preprocess_text folds into spaces. Without any, both strategies
+        # reduce to the whole text as one unit, so skip their regex scans.
+        if self.config.preserve_paragraphs and '\n' not in text:
+            whole_chunks = self._create_overlapping_chunks([text])
+            if whole_chunks and self._are_chunks_reasonable(whole_chunks):
+                return whole_chunks
+        elif self.config.preserve_paragraphs:
+            # Strategy 1: Section-based chunking
             section_chunks = self._chunk_by_sections(text)
             if section_chunks and self._are_chunks_reasonable(section_chunks):
                 return section_chunks
 
-        # Strategy 2: Paragraph-based chunking
-        if self.config.preserve_paragraphs:
+            # Strategy 2: Paragraph-based chunking
             paragraph_chunks = self._chunk_by_paragraphs(text)
             if paragraph_chunks and self._are_chunks_reasonable(paragraph_chunks):
                 return paragraph_chunks
@@ -192,12 +326,13 @@ class TextChunker:
                     chunks.append(chunk)
                 break
 
-            # Find word boundary
-            while end > start and text[end] not in ' \n\t':
-                end -= 1
+            # Find word boundary: the last break in (start, end], via C-level rfind
+            boundary = max(text.rfind(' ', start + 1, end + 1),
+                           text.rfind('\n', start + 1, end + 1),
+                           text.rfind('\t', start + 1, end + 1))
 
-            if end == start:  # No word boundary found
-                end = start + self.config.chunk_size
+            if boundary != -1:  # No word boundary found: keep the cut at chunk_size
+                end = boundary
 
             chunk = text[start:end].strip()
             if len(chunk) >= self.config.min_chunk_size:
@@ -211,37 +346,47 @@ class TextChunker:
     def _create_overlapping_chunks(self, units: List[str]) -> List[str]:
         """Create chunks from text units with overlap."""
         chunks = []
-        current_chunk = ""
+        # Units of the current chunk, joined once when it is finalized rather
+        # than re-concatenated per unit; current_size is the joined length
+        parts = []
         current_size = 0
+        # Config values and the bound method are fixed for the whole loop
+        chunk_size = self.config.chunk_size
+        min_chunk_size = self.config.min_chunk_size
+        get_overlap_text = self._get_overlap_text
 
-        i = 0
-        while i < len(units):
-            unit = units[i]
+        for unit in units:
             unit_size = len(unit)
 
             # Check if adding this unit exceeds chunk size
-            if current_size + unit_size > self.config.chunk_size and current_chunk:
+            if current_size + unit_size > chunk_size and current_size:
+                current_chunk = " ".join(parts)
+
                 # Save current chunk
-                if current_size >= self.config.min_chunk_size:
+                if current_size >= min_chunk_size:
                     chunks.append(current_chunk.strip())
 
                 # Start new chunk with overlap
-                overlap_text = self._get_overlap_text(current_chunk)
-                current_chunk = overlap_text + " " + unit if overlap_text else unit
-                current_size = len(current_chunk)
-            else:
-                # Add unit to current chunk
-                if current_chunk:
-                    current_chunk += " " + unit
+                overlap_text = get_overlap_text(current_chunk)
+                if overlap_text:
+                    parts = [overlap_text, unit]
+                    current_size = len(overlap_text) + 1 + unit_size
                 else:
-                    current_chunk = unit
-                current_size = len(current_chunk)
-
-            i += 1
+                    parts = [unit]
+                    current_size = unit_size
+            elif current_size:
+                # Add unit to current chunk
+                parts.append(unit)
+                current_size += 1 + unit_size
+            else:
+                parts = [unit]
+                current_size = unit_size
 
         # Add final chunk
-        if current_chunk.strip() and len(current_chunk) >= self.config.min_chunk_size:
-            chunks.append(current_chunk.strip())
+        if current_size >= min_chunk_size:
+            current_chunk = " ".join(parts)
+            if current_chunk.strip():
+                chunks.append(current_chunk.strip())
 
         return chunks
 
@@ -299,7 +444,7 @@ class TextChunker:
                 continue
 
             # Content validation (not just whitespace or special chars)
-            if not re.search(r'[a-zA-Z0-9]', chunk):
+            if not self.alnum_pattern.search(chunk):
                 continue
 
             # Remove excessive repetition
@@ -326,20 +471,31 @@ class TextChunker:
         if not chunks:
             return {}
 
-        sizes = [len(chunk) for chunk in chunks]
-        word_counts = [len(chunk.split()) for chunk in chunks]
+        sizes = list(map(len, chunks))
+        total_characters = sum(sizes)
+        total_words = sum(len(chunk.split()) for chunk in chunks)
+
+        # Size buckets in one pass over the sizes
+        small_limit = self.config.chunk_size * 0.5
+        large_limit = self.config.chunk_size * 1.5
+        small = large = 0
+        for size in sizes:
+            if size < small_limit:
+                small += 1
+            elif size > large_limit:
+                large += 1
 
         return {
             'total_chunks': len(chunks),
-            'total_characters': sum(sizes),
-            'total_words': sum(word_counts),
-            'avg_chunk_size': sum(sizes) / len(sizes),
-            'avg_words_per_chunk': sum(word_counts) / len(word_counts),
+            'total_characters': total_characters,
+            'total_words': total_words,
+            'avg_chunk_size': total_characters / len(sizes),
+            'avg_words_per_chunk': total_words / len(chunks),
             'min_chunk_size': min(sizes),
             'max_chunk_size': max(sizes),
             'size_distribution': {
-                'small': len([s for s in sizes if s < self.config.chunk_size * 0.5]),
-                'medium': len([s for s in sizes if self.config.chunk_size * 0.5 <= s <= self.config.chunk_size * 1.5]),
-                'large': len([s for s in sizes if s > self.config.chunk_size * 1.5])
+                'small': small,
+                'medium': len(sizes) - small - large,
+                'large': large
             }
         }
@@ -2,33 +2,88 @@
 Embedding service for document vectorization using sentence-transformers.
 """
 
+import hashlib
 import logging
+from collections import OrderedDict
 from typing import List, Optional, Union
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
 
 try:
     from sentence_transformers import SentenceTransformer
     import torch
-    import numpy as np
     SENTENCE_TRANSFORMERS_AVAILABLE = True
 except ImportError:
     SentenceTransformer = None
     torch = None
-    np = None
     SENTENCE_TRANSFORMERS_AVAILABLE = False
 
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    xxhash = None
+    XXHASH_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Most texts one coalesced model.encode call takes from queued requests
+EMBED_COALESCE_MAX_TEXTS = 64
+
+# Embeddings kept per service, keyed by text hash (~1.5 KB each at 384 float32 dims)
+EMBEDDING_CACHE_SIZE = 10000
+
+
+def quantize_int8_rows(vecs: "np.ndarray"):
+    """
+    Quantize each row to int8 levels with its own scale.
+
+    Returns (int8 matrix, float32 scales) where row * scale approximates the
+    original; a quarter of the float32 footprint. Stored embedding_scale
+    values (PostgreSQL and ChromaDB metadata) follow this multiply convention.
+    """
+    vecs = np.asarray(vecs, dtype=np.float32)
+    scales = np.abs(vecs).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    quantized = np.rint(vecs / scales[:, None]).astype(np.int8)
+    return quantized, scales.astype(np.float32)
+
+
 class EmbeddingService:
     """Service for generating document embeddings using sentence-transformers."""
 
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
-        """Initialize the embedding service."""
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2", dimensions: Optional[int] = None):
+        """
+        Initialize the embedding service.
+
+        Args:
+            model_name: Sentence transformer model name
+            dimensions: Optional target size; embeddings are truncated to their
+                leading dimensions and re-normalized (Matryoshka-style)
+        """
         self.model_name = model_name
         self.model = None
-        self.embedding_dim = 384  # Dimension for all-MiniLM-L6-v2
-        self.executor = ThreadPoolExecutor(max_workers=4)
+        self.dimensions = dimensions
+        self.embedding_dim = dimensions or 384  # Dimension for all-MiniLM-L6-v2
+        # One background batcher per event loop runs every encode, merging
+        # requests that queue up while the previous call is in flight
+        self._batch_loop = None
+        self._batch_queue = None
+        self._batcher_task = None
+        # Recently embedded texts: hash -> float32 ndarray, in LRU order
+        self._embedding_cache = OrderedDict()
+        # Unit-normalized document matrix for similarity_search(): float32, or
+        # int8 levels with per-row scales when cached with quantize=True
+        self._doc_matrix = None
+        self._doc_scales = None
+        # Shared read-only zero row for blank texts, sized once the model is loaded
+        self._zero_vec = None
 
         if SENTENCE_TRANSFORMERS_AVAILABLE:
             logger.info(f"Initializing embedding service with model: {model_name}")
@@ -36,6 +91,10 @@ class EmbeddingService:
         else:
             logger.warning("Sentence transformers not available - using mock embeddings")
 
+        if np is not None:
+            self._zero_vec = np.zeros(self.embedding_dim, dtype=np.float32)
+            self._zero_vec.setflags(write=False)
+
     def _load_model(self):
         """Load the sentence transformer model."""
         try:
@@ -44,6 +103,7 @@ class EmbeddingService:
                 # Move to GPU if available
                 if torch and torch.cuda.is_available():
                     self.model = self.model.cuda()
+                    self._optimize_for_gpu()
                     logger.info("Model loaded on GPU")
                 else:
                     logger.info("Model loaded on CPU")
@@ -51,6 +111,8 @@ class EmbeddingService:
                 # Test embedding to get actual dimension
                 test_embedding = self.model.encode(["test"], convert_to_tensor=False)
                 self.embedding_dim = len(test_embedding[0])
+                if self.dimensions and self.dimensions < self.embedding_dim:
+                    self.embedding_dim = self.dimensions
                 logger.info(f"Model loaded successfully. Embedding dimension: {self.embedding_dim}")
             else:
                 logger.warning("Cannot load model - sentence transformers not available")
@@ -58,7 +120,32 @@ class EmbeddingService:
             logger.error(f"Failed to load embedding model: {e}")
             self.model = None
 
-    def _encode_sync(self, texts: List[str]) -> List[List[float]]:
+    def _optimize_for_gpu(self):
+        """
+        Run the GPU model in half precision and compile its transformer.
+
+        FP16 halves weight and activation memory traffic and enables the
+        fused attention kernels. torch.compile is lazy, so a warm-up encode
+        triggers compilation here; if it fails the eager module is restored.
+        Shapes are compiled dynamically because every batch pads to a
+        different sequence length.
+        """
+        try:
+            self.model = self.model.half()
+        except Exception as e:
+            logger.warning(f"FP16 conversion failed, keeping FP32: {e}")
+            return
+
+        transformer = self.model[0]
+        eager_model = transformer.auto_model
+        try:
+            transformer.auto_model = torch.compile(eager_model, dynamic=True)
+            self.model.encode(["warm-up"], convert_to_tensor=False)
+        except Exception as e:
+            transformer.auto_model = eager_model
+            logger.warning(f"torch.compile failed, using eager model: {e}")
+
+    def _encode_sync(self, texts: List[str], batch_size: int = 16) -> List[List[float]]:
         """Synchronous encoding function."""
         if not SENTENCE_TRANSFORMERS_AVAILABLE or self.model is None:
             # Return mock embeddings
@@ -70,11 +157,13 @@ class EmbeddingService:
                 texts,
                 convert_to_tensor=False,
                 show_progress_bar=len(texts) > 10,
-                batch_size=16
+                batch_size=batch_size
             )
 
             # Convert to list of lists
             if isinstance(embeddings, np.ndarray):
+                if embeddings.shape[-1] > self.embedding_dim:
+                    embeddings = self._truncate(embeddings)
                 return embeddings.tolist()
             else:
                 return embeddings
@@ -84,27 +173,100 @@ class EmbeddingService:
             # Return mock embeddings on error
             return [[0.1] * self.embedding_dim for _ in texts]
 
+    def encode_array(self, texts: List[str], batch_size: int = 16) -> Union["np.ndarray", List[List[float]]]:
+        """
+        Encode texts to a contiguous (N, D) float32 array, synchronously.
+
+        Encoding errors propagate so callers never store mock vectors by
+        mistake. Only when the service has no model (see is_available) are
+        mock embeddings returned, as lists.
+        """
+        if not self.is_available():
+            return self._encode_sync(texts, batch_size=batch_size)
+
+        embeddings = self.model.encode(
+            texts,
+            convert_to_numpy=True,
+            show_progress_bar=len(texts) > 10,
+            batch_size=batch_size
+        )
+        if embeddings.shape[-1] > self.embedding_dim:
+            embeddings = self._truncate(embeddings)
+        return np.ascontiguousarray(embeddings, dtype=np.float32)
+
+    def _truncate(self, embeddings: "np.ndarray") -> "np.ndarray":
+        """Keep the leading dimensions and restore unit length."""
+        embeddings = embeddings[:, :self.embedding_dim]
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings / np.maximum(norms, 1e-12)
+
     async def embed_text(self, text: str) -> List[float]:
         """Generate embedding for a single text."""
         return (await self.embed_texts([text]))[0]
 
-    async def embed_texts(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings for multiple texts."""
+    async def embed_texts(self, texts: List[str], batch_size: int = 16, strict: bool = False) -> List[List[float]]:
+        """
+        Generate embeddings for multiple texts.
+
+        Encoding errors yield mock embeddings unless strict is set, in which
+        case they are raised.
+        """
+        return [self._as_list(row) for row in await self._embed_rows(texts, batch_size, strict)]
+
+    async def _embed_rows(self, texts: List[str], batch_size: int = 16, strict: bool = False) -> list:
+        """
+        Embed texts, returning one row per input.
+
+        Rows stay float32 arrays (views into the encoded batch or cached
+        copies) so callers convert to Python floats once, at the boundary;
+        blank texts all reference one shared read-only zero row, which
+        callers must not mutate.
+        """
         if not texts:
             return []
 
         # Filter out empty texts
         valid_texts = [text.strip() for text in texts if text.strip()]
         if not valid_texts:
-            return [[0.0] * self.embedding_dim for _ in texts]
-
-        # Run encoding in thread pool to avoid blocking
-        loop = asyncio.get_event_loop()
-        embeddings = await loop.run_in_executor(
-            self.executor,
-            self._encode_sync,
-            valid_texts
-        )
+            return [self._zero_row() for _ in texts]
+
+        # Serve repeated texts from the cache; only unseen ones are encoded
+        cache = self._embedding_cache if self.is_available() else None
+        keys = [self._text_key(text) for text in valid_texts]
+        embeddings = [None] * len(valid_texts)
+        misses = {}
+        for i, key in enumerate(keys):
+            cached = cache.get(key) if cache is not None else None
+            if cached is not None:
+                cache.move_to_end(key)
+                embeddings[i] = cached
+            else:
+                misses.setdefault(key, []).append(i)
+
+        if misses:
+            miss_texts = [valid_texts[positions[0]] for positions in misses.values()]
+
+            # Hand the texts to the batcher; encoding runs off the event loop
+            future = asyncio.get_running_loop().create_future()
+            await self._get_batch_queue().put((miss_texts, batch_size, future))
+            try:
+                miss_embeddings = await future
+            except Exception as e:
+                if strict:
+                    raise
+                logger.error(f"Error generating embeddings: {e}")
+                # Mock rows keep callers working but are never cached
+                miss_embeddings = [[0.1] * self.embedding_dim for _ in miss_texts]
+                cache = None
+
+            for (key, positions), embedding in zip(misses.items(), miss_embeddings):
+                for i in positions:
+                    embeddings[i] = embedding
+                if cache is not None:
+                    # Copy so the cache does not pin the whole encoded batch
+                    cache[key] = np.array(embedding, dtype=np.float32)
+                    if len(cache) > EMBEDDING_CACHE_SIZE:
+                        cache.popitem(last=False)
 
         # Handle cases where original texts had empty strings
         result = []
@@ -114,33 +276,107 @@ class EmbeddingService:
                 result.append(embeddings[valid_idx])
                 valid_idx += 1
             else:
-                result.append([0.0] * self.embedding_dim)
+                result.append(self._zero_row())
 
         return result
 
+    def _zero_row(self):
+        """Zero embedding: the shared read-only array, or a fresh list without numpy."""
+        if self._zero_vec is not None:
+            return self._zero_vec
+        return [0.0] * self.embedding_dim
+
+    @staticmethod
+    def _as_list(row) -> List[float]:
+        """Convert an embedding row to a list of floats."""
+        return row.tolist() if hasattr(row, "tolist") else row
+
+    @staticmethod
+    def _text_key(text: str) -> int:
+        """64-bit content hash of a text for the embedding cache."""
+        data = text.encode("utf-8", "surrogatepass")
+        if XXHASH_AVAILABLE:
+            return xxhash.xxh3_64_intdigest(data)
+        return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+    def _get_batch_queue(self) -> asyncio.Queue:
+        """Return the request queue for the running loop, starting its batcher if needed."""
+        loop = asyncio.get_running_loop()
+        if self._batch_loop is not loop or self._batcher_task.done():
+            self._batch_loop = loop
+            self._batch_queue = asyncio.Queue()
+            self._batcher_task = loop.create_task(self._run_batcher(self._batch_queue))
+        return self._batch_queue
+
+    async def _run_batcher(self, queue: asyncio.Queue):
+        """
+        Serve queued embed requests with one model.encode call at a time.
+
+        Requests already waiting are merged into the call (up to
+        EMBED_COALESCE_MAX_TEXTS texts) and results are split back per request.
+        Nothing waits for more requests to arrive, so a lone request adds no latency.
+        """
+        while True:
+            pending = [await queue.get()]
+            total = len(pending[0][0])
+            while total < EMBED_COALESCE_MAX_TEXTS and not queue.empty():
+                item = queue.get_nowait()
+                pending.append(item)
+                total += len(item[0])
+
+            all_texts = [text for texts, _, _ in pending for text in texts]
+            batch_size = max(size for _, size, _ in pending)
+            # Errors reach every waiting request instead of turning into mock rows
+            try:
+                embeddings = await asyncio.to_thread(self.encode_array, all_texts, batch_size)
+            except Exception as e:
+                for _, _, future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            offset = 0
+            for texts, _, future in pending:
+                if not future.done():
+                    future.set_result(embeddings[offset:offset + len(texts)])
+                offset += len(texts)
+
     async def embed_documents(
         self,
         documents: List[str],
-        batch_size: int = 16
+        batch_size: int = 32
     ) -> List[List[float]]:
-        """Generate embeddings for documents in batches."""
+        """Generate embeddings for documents in concurrent batches."""
         if not documents:
             return []
 
-        all_embeddings = []
-
-        # Process in batches
-        for i in range(0, len(documents), batch_size):
-            batch = documents[i:i + batch_size]
-            batch_embeddings = await self.embed_texts(batch)
-            all_embeddings.extend(batch_embeddings)
-
-            # Log progress
-            if len(documents) > batch_size:
-                progress = min(i + batch_size, len(documents))
-                logger.info(f"Embedded {progress}/{len(documents)} documents")
-
-        return all_embeddings
+        # Batch documents of similar length together: each batch is padded to
+        # its longest sequence, so mixing short and long texts wastes compute
+        order = sorted(range(len(documents)), key=lambda i: len(documents[i]))
+        batches = [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+
+        # Batches are submitted together; the batcher runs one encode at a time
+        results = await asyncio.gather(*(
+            self._embed_rows([documents[i] for i in batch], batch_size=batch_size) for batch in batches
+        ))
+
+        if len(batches) > 1:
+            logger.info(f"Embedded {len(documents)} documents in {len(batches)} batches")
+
+        if np is None:
+            # Scatter back to the callers' order
+            embeddings = [None] * len(documents)
+            for batch, batch_embeddings in zip(batches, results):
+                for i, embedding in zip(batch, batch_embeddings):
+                    embeddings[i] = embedding
+            return embeddings
+
+        # Scatter rows into one preallocated matrix in the callers' order,
+        # then convert it to lists in a single call
+        embeddings = np.empty((len(documents), self.embedding_dim), dtype=np.float32)
+        for batch, batch_embeddings in zip(batches, results):
+            embeddings[batch] = batch_embeddings
+        return embeddings.tolist()
 
     def get_embedding_dimension(self) -> int:
         """Get the dimension of embeddings."""
@@ -150,38 +386,73 @@ class EmbeddingService:
         """Check if the embedding service is available."""
         return SENTENCE_TRANSFORMERS_AVAILABLE and self.model is not None
 
+    def set_document_embeddings(self, document_embeddings: List[List[float]], quantize: bool = False) -> None:
+        """
+        Cache a document matrix for repeated similarity_search() calls.
+
+        Rows are L2-normalized once and stored as contiguous float32, so each
+        search is a single matrix-vector product. With quantize=True they are
+        kept as int8 levels plus per-row scales (4x less memory to stream per
+        search) and scores become close approximations of the cosine.
+        """
+        matrix = self._normalize_rows(document_embeddings)
+        if quantize:
+            self._doc_matrix, self._doc_scales = quantize_int8_rows(matrix)
+        else:
+            self._doc_matrix, self._doc_scales = matrix, None
+
+    @staticmethod
+    def _normalize_rows(vectors) -> "np.ndarray":
+        """Return vectors as a C-contiguous float32 matrix of unit rows (zero rows stay zero)."""
+        matrix = np.array(vectors, dtype=np.float32, ndmin=2, order="C")
+        matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+        return matrix
+
     async def similarity_search(
         self,
         query_embedding: List[float],
-        document_embeddings: List[List[float]],
+        document_embeddings: Optional[List[List[float]]] = None,
         top_k: int = 5
     ) -> List[tuple]:
-        """Find most similar documents based on cosine similarity."""
+        """
+        Find most similar documents based on cosine similarity.
+
+        Searches document_embeddings when given, else the matrix cached by
+        set_document_embeddings().
+        """
+        doc_count = len(document_embeddings) if document_embeddings is not None else (
+            len(self._doc_matrix) if self._doc_matrix is not None else 0
+        )
         if not SENTENCE_TRANSFORMERS_AVAILABLE:
             # Return mock results
-            return [(i, 0.5) for i in range(min(top_k, len(document_embeddings)))]
+            return [(i, 0.5) for i in range(min(top_k, doc_count))]
 
         try:
-            import numpy as np
-            from sklearn.metrics.pairwise import cosine_similarity
-
-            # Convert to numpy arrays
-            query_vec = np.array(query_embedding).reshape(1, -1)
-            doc_vecs = np.array(document_embeddings)
-
-            # Compute cosine similarities
-            similarities = cosine_similarity(query_vec, doc_vecs)[0]
-
-            # Get top-k most similar documents
-            top_indices = np.argsort(similarities)[::-1][:top_k]
+            query_vec = self._normalize_rows(query_embedding)[0]
+
+            if document_embeddings is not None:
+                # One GEMV over the unit-length rows gives every cosine similarity
+                similarities = self._normalize_rows(document_embeddings) @ query_vec
+            elif self._doc_matrix is None:
+                return []
+            elif self._doc_scales is None:
+                similarities = self._doc_matrix @ query_vec
+            else:
+                # Integer dot products (int32 accumulators: 127*127*dim cannot
+                # overflow), rescaled by the document and query scales
+                query_int8, query_scale = quantize_int8_rows(query_vec[None, :])
+                dots = self._doc_matrix @ query_int8[0].astype(np.int32)
+                similarities = dots * (self._doc_scales * query_scale[0])
+
+            # Top-k in O(n), then sort only those k
+            k = min(top_k, len(similarities))
+            if k <= 0:
+                return []
+            top_indices = np.argpartition(-similarities, k - 1)[:k]
+            top_indices = top_indices[np.argsort(-similarities[top_indices])]
 
             return [(int(idx), float(similarities[idx])) for idx in top_indices]
 
         except Exception as e:
             logger.error(f"Error in similarity search: {e}")
-            return [(i, 0.5) for i in range(min(top_k, len(document_embeddings)))]
-
-    def __del__(self):
-        """Cleanup resources."""
-        if hasattr(self, 'executor'):
-            self.executor.shutdown(wait=False)
+            return [(i, 0.5) for i in range(min(top_k, doc_count))]